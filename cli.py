@@ -0,0 +1,185 @@
+"""
+Ponto de entrada único do pipeline.
+
+    python cli.py generate [--v1] | prepare [zip] | eda [--versao N]
+                  tune | train | prune | export [--formato onnx|ncnn] | infer
+                  record <arquivo> | replay <arquivo>
+
+Só a biblioteca padrão é importada aqui em cima: ultralytics, torch,
+pandas, seaborn etc. são carregados dentro do subcomando que precisa
+deles, então `--help` (e qualquer erro de argumento) responde na hora.
+O tempo de startup é verificado em tests/test_cli_startup.py.
+"""
+import os
+import sys
+import argparse
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PATH_GERACAO = os.path.join(BASE_DIR, 'geracao_data_augmentation')
+PATH_EDA = os.path.join(BASE_DIR, 'analise_dataset')
+DATA_YAML = os.path.join('dataset_para_treino', 'data.yaml')
+
+# Módulos que não podem ser carregados só por importar o cli (ver tests/)
+HEAVY_MODULES = ['ultralytics', 'torch', 'cv2', 'pandas', 'seaborn', 'matplotlib', 'albumentations']
+
+
+def _use_dir(path):
+    # As pastas de geração/EDA são scripts soltos que importam os vizinhos
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+# ========== SUBCOMANDOS ==========
+def cmd_generate(args):
+    _use_dir(PATH_GERACAO)
+    if args.v1:
+        from gerar_dataset import generate
+    else:
+        from gerar_dataset_v2 import generate
+    generate()
+
+
+def cmd_prepare(args):
+    from prepare_dataset import organize_dataset
+    organize_dataset(args.zip, output_dir=args.saida)
+
+
+def cmd_eda(args):
+    _use_dir(PATH_EDA)
+    if args.versao == 1:
+        from eda import run_robust_eda
+        run_robust_eda(args.data)
+    elif args.versao == 2:
+        from eda2 import run_enhanced_eda
+        run_enhanced_eda(args.data)
+    else:
+        from eda3 import YOLOExplorer
+        explorer = YOLOExplorer(os.path.join(os.path.dirname(args.data), 'train'))
+        explorer.build_dataframe()
+        explorer.analyze_class_balance()
+        explorer.analyze_bbox_geometry()
+        explorer.analyze_spatial_heatmap()
+
+
+def cmd_tune(args):
+    from optimization import run_optimization
+    run_optimization()
+
+
+def cmd_train(args):
+    from train import start_final_training
+    start_final_training()
+
+
+def cmd_prune(args):
+    from pruning import run_pruning
+    run_pruning()
+
+
+def cmd_export(args):
+    if args.imgsz:
+        # Sweep: todas as combinações formato x imgsz, lado a lado no cache
+        from export_cache import export_sweep
+        from pt_para_onnx import OPSET
+        export_sweep(args.weights, [
+            {'format': fmt, 'imgsz': size, 'opset': OPSET, 'half': fmt == 'ncnn', 'simplify': True}
+            for fmt in args.formato for size in args.imgsz
+        ])
+        return
+
+    for fmt in args.formato:
+        if fmt == 'onnx':
+            from pt_para_onnx import export_onnx
+            print(export_onnx(args.weights))
+        else:
+            from ncnn_exportacao import export_ncnn
+            print(export_ncnn(args.weights))
+
+
+def cmd_infer(args):
+    from main import run_inference
+    run_inference(args.modelo, source=args.source, conf=args.conf, gated=not args.sem_agendador)
+
+
+def cmd_record(args):
+    from replay import record
+    record(args.source, args.arquivo, duration=args.duracao, max_frames=args.max_frames)
+
+
+def cmd_replay(args):
+    import json
+    from replay import load_recording, replay, yolo_backend, print_summary
+    with load_recording(args.arquivo) as recording:
+        summary = replay(recording, yolo_backend(args.modelo, conf=args.conf, imgsz=args.imgsz), fps=args.fps)
+    print_summary(summary)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(summary, f, indent=2)
+
+
+# ========== PARSER ==========
+def build_parser():
+    parser = argparse.ArgumentParser(prog='cli.py', description='Pipeline de visão DeltaV.')
+    sub = parser.add_subparsers(dest='comando', required=True)
+
+    p = sub.add_parser('generate', help='gera o dataset sintético')
+    p.add_argument('--v1', action='store_true', help='usa o gerar_dataset.py (padrão: v2)')
+    p.set_defaults(func=cmd_generate)
+
+    p = sub.add_parser('prepare', help='organiza o ZIP do CVAT em train/val/test')
+    p.add_argument('zip', nargs='?', default='manometro_v2.zip')
+    p.add_argument('--saida', default='dataset_para_treino')
+    p.set_defaults(func=cmd_prepare)
+
+    p = sub.add_parser('eda', help='análise exploratória do dataset')
+    p.add_argument('--versao', type=int, choices=[1, 2, 3], default=1)
+    p.add_argument('--data', default=DATA_YAML)
+    p.set_defaults(func=cmd_eda)
+
+    p = sub.add_parser('tune', help='otimização de hiperparâmetros')
+    p.set_defaults(func=cmd_tune)
+
+    p = sub.add_parser('train', help='treino final com os melhores hiperparâmetros')
+    p.set_defaults(func=cmd_train)
+
+    p = sub.add_parser('prune', help='poda de canais + fine-tune')
+    p.set_defaults(func=cmd_prune)
+
+    p = sub.add_parser('export', help='exporta o modelo para ONNX ou NCNN')
+    p.add_argument('--formato', nargs='+', choices=['onnx', 'ncnn'], default=['ncnn'])
+    p.add_argument('--weights', default='best.pt')
+    p.add_argument('--imgsz', nargs='+', type=int, help='faz um sweep de tamanhos (usa o cache)')
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser('infer', help='inferência em tempo real')
+    p.add_argument('--modelo', default='plataforma_voo_v1.pt')
+    p.add_argument('--source', default='2')
+    p.add_argument('--conf', type=float, default=0.9)
+    p.add_argument('--sem-agendador', action='store_true', help='infere em todos os frames')
+    p.set_defaults(func=cmd_infer)
+
+    p = sub.add_parser('record', help='grava frames da câmera/stream com timestamp')
+    p.add_argument('arquivo')
+    p.add_argument('--source', default='0')
+    p.add_argument('--duracao', type=float, help='segundos de gravação')
+    p.add_argument('--max-frames', type=int)
+    p.set_defaults(func=cmd_record)
+
+    p = sub.add_parser('replay', help='benchmark de latência reproduzindo uma gravação')
+    p.add_argument('arquivo')
+    p.add_argument('--modelo', default='plataforma_voo_v1.pt')
+    p.add_argument('--conf', type=float, default=0.9)
+    p.add_argument('--imgsz', type=int)
+    p.add_argument('--fps', type=float, help='FPS fixo (padrão: timestamps originais)')
+    p.add_argument('--json', help='salva o resumo em JSON')
+    p.set_defaults(func=cmd_replay)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+if __name__ == '__main__':
+    main()
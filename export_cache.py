@@ -0,0 +1,183 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import tempfile
+
+# ================= CONFIG =================
+CACHE_DIR = '.export_cache'
+HASHES_NAME = 'hashes.json'
+MANIFEST_NAME = 'manifest.json'
+SWEEP_NAME = 'sweep.json'
+CHUNK = 1 << 20
+
+
+# ========== CHAVES ==========
+def weights_hash(weights, cache_dir=CACHE_DIR):
+    """SHA-256 do .pt, memorizado por (caminho, tamanho, mtime) para não reler o arquivo."""
+    path = os.path.abspath(weights)
+    stat = os.stat(path)
+    memo_path = os.path.join(cache_dir, HASHES_NAME)
+
+    memo = {}
+    if os.path.exists(memo_path):
+        with open(memo_path) as f:
+            memo = json.load(f)
+
+    entry = memo.get(path)
+    if entry and entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime:
+        return entry['sha256']
+
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK), b''):
+            h.update(chunk)
+
+    memo[path] = {'size': stat.st_size, 'mtime': stat.st_mtime, 'sha256': h.hexdigest()}
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(memo_path, 'w') as f:
+        json.dump(memo, f, indent=2)
+    return h.hexdigest()
+
+
+def export_tag(format, imgsz, opset=None, half=False, simplify=False):
+    """Nome legível (e único) da combinação de argumentos de exportação."""
+    return f"{format}_{imgsz}_op{opset or 'auto'}_{'fp16' if half else 'fp32'}_{'simp' if simplify else 'raw'}"
+
+
+def entry_dir(digest, tag, cache_dir=CACHE_DIR):
+    # Todos os formatos de um mesmo .pt ficam lado a lado
+    return os.path.join(cache_dir, digest[:16], tag)
+
+
+def lookup(digest, tag, cache_dir=CACHE_DIR):
+    manifest_path = os.path.join(entry_dir(digest, tag, cache_dir), MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    if not os.path.exists(manifest['artifact']):
+        return None
+    return manifest
+
+
+# ========== EXPORTAÇÃO ==========
+def _store(src, digest, tag, manifest, cache_dir):
+    dst_dir = entry_dir(digest, tag, cache_dir)
+    if os.path.exists(dst_dir):
+        shutil.rmtree(dst_dir)
+    os.makedirs(dst_dir)
+
+    artifact = os.path.join(dst_dir, os.path.basename(src.rstrip(os.sep)))
+    shutil.move(src, artifact)
+
+    manifest = dict(manifest, artifact=os.path.abspath(artifact))
+    with open(os.path.join(dst_dir, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def publish(artifact, weights):
+    """
+    Copia o artefato do cache para onde a Ultralytics o deixaria (ao lado do
+    .pt: `best.onnx`, `best_ncnn_model/`), substituindo uma cópia antiga.
+    """
+    dst = os.path.join(os.path.dirname(os.path.abspath(weights)), os.path.basename(artifact.rstrip(os.sep)))
+    if os.path.isdir(dst):
+        shutil.rmtree(dst)
+    if os.path.isdir(artifact):
+        shutil.copytree(artifact, dst)
+    else:
+        shutil.copy2(artifact, dst)
+    return dst
+
+
+def cached_export(weights, format, imgsz, opset=None, half=False, simplify=False,
+                  cache_dir=CACHE_DIR, publish_output=True):
+    """
+    Exporta `weights` com a Ultralytics só se a combinação (hash do .pt +
+    argumentos) ainda não estiver no cache; senão devolve o artefato na hora.
+    Retorna o manifesto da entrada (caminho do artefato, argumentos, tempo).
+    Com `publish_output` o artefato também é copiado para ao lado do .pt
+    (chave `output`), no mesmo caminho de uma exportação sem cache.
+
+    Cada formato é exportado do .pt: a Ultralytics gera o NCNN a partir de
+    TorchScript (PNNX), não do ONNX, então um ONNX em cache não encurta a
+    exportação NCNN. O ganho vem de não repetir exportações já feitas.
+    """
+    digest = weights_hash(weights, cache_dir)
+    tag = export_tag(format, imgsz, opset, half, simplify)
+
+    hit = lookup(digest, tag, cache_dir)
+    if hit:
+        return _result(hit, weights, publish_output, cache_hit=True)
+
+    from ultralytics import YOLO
+
+    # Exporta numa pasta temporária dentro do cache (mesmo disco: o move é um rename)
+    os.makedirs(cache_dir, exist_ok=True)
+    work = tempfile.mkdtemp(dir=cache_dir, prefix='work_')
+    try:
+        local = os.path.join(work, os.path.basename(weights))
+        shutil.copy2(weights, local)
+
+        start = time.perf_counter()
+        kwargs = {'format': format, 'imgsz': imgsz, 'half': half, 'simplify': simplify}
+        if opset:
+            kwargs['opset'] = opset
+        artifact = str(YOLO(local).export(**kwargs))
+        elapsed = time.perf_counter() - start
+
+        base = {
+            'weights': os.path.abspath(weights),
+            'sha256': digest,
+            'format': format,
+            'imgsz': imgsz,
+            'opset': opset,
+            'half': half,
+            'simplify': simplify,
+            'export_s': round(elapsed, 2),
+        }
+        manifest = _store(artifact, digest, tag, base, cache_dir)
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+    return _result(manifest, weights, publish_output, cache_hit=False)
+
+
+def _result(manifest, weights, publish_output, cache_hit):
+    output = publish(manifest['artifact'], weights) if publish_output else None
+    return dict(manifest, cache_hit=cache_hit, output=output)
+
+
+def export_sweep(weights, configs, cache_dir=CACHE_DIR):
+    """
+    Exporta todas as combinações de `configs` (dicts com os argumentos de
+    `cached_export`) e salva o resumo em `sweep.json`, ao lado dos artefatos.
+    Os artefatos ficam só no cache: as combinações teriam o mesmo nome ao
+    lado do .pt.
+    """
+    results = []
+    for cfg in configs:
+        m = cached_export(weights, cache_dir=cache_dir, publish_output=False, **cfg)
+        size = _size_mb(m['artifact'])
+        results.append(dict(m, size_mb=size))
+        status = 'cache' if m['cache_hit'] else f"{m['export_s']:.1f}s"
+        print(f"{export_tag(**cfg):<40} {size:>7.2f} MB  [{status}]  {m['artifact']}")
+
+    digest = weights_hash(weights, cache_dir)
+    with open(os.path.join(cache_dir, digest[:16], SWEEP_NAME), 'w') as f:
+        json.dump(results, f, indent=2)
+    return results
+
+
+def _size_mb(path):
+    if os.path.isdir(path):
+        total = sum(
+            os.path.getsize(os.path.join(root, name))
+            for root, _, files in os.walk(path) for name in files
+        )
+    else:
+        total = os.path.getsize(path)
+    return total / 2**20
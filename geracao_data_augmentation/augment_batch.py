@@ -0,0 +1,212 @@
+import os
+import time
+import random
+import numpy as np
+import cv2
+from PIL import Image
+
+# ================= CONFIG =================
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PATH_BGS = os.path.join(BASE_DIR, "input_bgs")
+
+BENCH_IMAGES = 64
+BENCH_BATCH_SIZE = 16
+
+# Linhas por faixa no ruído ISO (única etapa em float32)
+NOISE_STRIP_ROWS = 256
+
+# Mesmos limites do bg_augment (albumentations) abaixo
+BRIGHTNESS_LIMIT = 0.25
+CONTRAST_LIMIT = 0.25
+P_BRIGHTNESS_CONTRAST = 0.8
+
+ISO_COLOR_SHIFT = (0.01, 0.05)
+ISO_INTENSITY = (0.2, 0.4)
+P_ISO_NOISE = 0.4
+
+BLUR_LIMIT = (3, 9)
+P_MOTION_BLUR = 0.3
+
+SHADOW_ROI = (0, 0.5, 1, 1)  # x_min, y_min, x_max, y_max (normalizado)
+NUM_SHADOWS = (1, 3)
+SHADOW_VERTICES = 6
+SHADOW_FACTOR = 0.5
+P_SHADOW = 0.4
+
+SHADOW_LUT = (np.arange(256) * SHADOW_FACTOR).astype(np.uint8)
+
+
+# ========== CARREGAMENTO ==========
+def load_backgrounds(paths):
+    """Carrega os fundos direto em RGB (sem passar por RGBA), graváveis."""
+    return [np.array(Image.open(p).convert("RGB")) for p in paths]
+
+
+# ========== KERNELS ==========
+# Todos recebem uma lista de imagens uint8 (H, W, 3), de tamanhos quaisquer,
+# e alteram cada uma in-place. Os parâmetros são sorteados por amostra de uma
+# vez para o lote; a operação roda imagem a imagem em uint8 com OpenCV
+# (LUT/filter2D/copyTo), sem empilhar o lote numa cópia extra.
+
+def brightness_contrast(images, rng):
+    n = len(images)
+    apply = rng.random(n) < P_BRIGHTNESS_CONTRAST
+    alpha = 1.0 + rng.uniform(-CONTRAST_LIMIT, CONTRAST_LIMIT, n)
+    beta = rng.uniform(-BRIGHTNESS_LIMIT, BRIGHTNESS_LIMIT, n) * 255.0
+
+    # Uma LUT de 256 entradas por amostra
+    values = np.arange(256, dtype=np.float32)
+    luts = np.clip(values[None] * alpha[:, None] + beta[:, None], 0, 255).astype(np.uint8)
+
+    for i in np.flatnonzero(apply):
+        cv2.LUT(images[i], luts[i], dst=images[i])
+    return images
+
+
+def iso_noise(images, rng):
+    """
+    Mesma formulação do A.ISONoise, em HLS: ruído de Poisson na luminância
+    com média proporcional ao desvio padrão da luminância da própria imagem
+    (uma região lisa não recebe ruído) e mais forte nas áreas escuras, mais
+    uma rotação de matiz gaussiana de sigma `color_shift * 360 * intensity`.
+    """
+    idx = np.flatnonzero(rng.random(len(images)) < P_ISO_NOISE)
+    intensity = rng.uniform(*ISO_INTENSITY, idx.size)
+    color_shift = rng.uniform(*ISO_COLOR_SHIFT, idx.size)
+
+    for i, inten, shift in zip(idx, intensity, color_shift):
+        img = images[i]
+        h, w, _ = img.shape
+
+        # Desvio padrão da luminância HLS, L = (max + min) / 2 (em 0-1)
+        r, g, b = cv2.split(img)
+        lum2 = cv2.add(cv2.max(cv2.max(r, g), b), cv2.min(cv2.min(r, g), b), dtype=cv2.CV_16U)
+        lam = float(cv2.meanStdDev(lum2)[1][0, 0]) / 510.0 * inten * 255.0
+        hue_sigma = shift * 360.0 * inten
+
+        # Em faixas de linhas para limitar a memória temporária
+        for y in range(0, h, NOISE_STRIP_ROWS):
+            strip = img[y:y + NOISE_STRIP_ROWS]
+            rows = strip.shape[0]
+            hls = cv2.cvtColor(strip.astype(np.float32) / 255.0, cv2.COLOR_RGB2HLS)
+
+            hue, l = hls[..., 0], hls[..., 1]
+            hue += rng.standard_normal((rows, w), dtype=np.float32) * hue_sigma
+            np.mod(hue, 360.0, out=hue)
+            l += rng.poisson(lam, (rows, w)).astype(np.float32) / 255.0 * (1.0 - l)
+            np.clip(l, 0.0, 1.0, out=l)
+
+            rgb = cv2.cvtColor(hls, cv2.COLOR_HLS2RGB)
+            rgb *= 255.0
+            np.rint(rgb, out=rgb)
+            np.clip(rgb, 0, 255, out=rgb)
+            strip[...] = rgb
+    return images
+
+
+def motion_kernel(size, angle):
+    kernel = np.zeros((size, size), dtype=np.float32)
+    kernel[size // 2, :] = 1.0
+    rot = cv2.getRotationMatrix2D((size / 2 - 0.5, size / 2 - 0.5), angle, 1.0)
+    kernel = cv2.warpAffine(kernel, rot, (size, size))
+    total = kernel.sum()
+    return kernel / total if total > 0 else kernel
+
+
+def motion_blur(images, rng):
+    idx = np.flatnonzero(rng.random(len(images)) < P_MOTION_BLUR)
+    sizes = rng.integers(BLUR_LIMIT[0] // 2, BLUR_LIMIT[1] // 2 + 1, idx.size) * 2 + 1
+    angles = rng.uniform(0, 180, idx.size)
+
+    for i, size, angle in zip(idx, sizes, angles):
+        cv2.filter2D(images[i], -1, motion_kernel(int(size), angle), dst=images[i])
+    return images
+
+
+def shadow_mask(h, w, rng):
+    x_min, y_min = int(SHADOW_ROI[0] * w), int(SHADOW_ROI[1] * h)
+    x_max, y_max = int(SHADOW_ROI[2] * w), int(SHADOW_ROI[3] * h)
+
+    mask = np.zeros((h, w), dtype=np.uint8)
+    for _ in range(rng.integers(NUM_SHADOWS[0], NUM_SHADOWS[1] + 1)):
+        pts = np.stack([
+            rng.integers(x_min, max(x_max, x_min + 1), SHADOW_VERTICES),
+            rng.integers(y_min, max(y_max, y_min + 1), SHADOW_VERTICES),
+        ], axis=1).astype(np.int32)
+        cv2.fillPoly(mask, [pts], 1)
+    return mask
+
+
+def random_shadow(images, rng):
+    for i in np.flatnonzero(rng.random(len(images)) < P_SHADOW):
+        img = images[i]
+        shaded = cv2.LUT(img, SHADOW_LUT)
+        cv2.copyTo(shaded, shadow_mask(img.shape[0], img.shape[1], rng), img)
+    return images
+
+
+def augment_batch(images, rng=None):
+    """
+    Equivalente do bg_augment para um lote de fundos RGB uint8, de tamanhos
+    quaisquer. Os parâmetros aleatórios são sorteados por amostra para o lote
+    inteiro e as imagens são alteradas in-place (cada uma é copiada só se for
+    somente leitura). Retorna a lista na mesma ordem da entrada.
+    """
+    rng = rng or np.random.default_rng(random.getrandbits(32))
+    images = [img if img.flags.writeable else img.copy() for img in images]
+    brightness_contrast(images, rng)
+    iso_noise(images, rng)
+    motion_blur(images, rng)
+    random_shadow(images, rng)
+    return images
+
+
+# ================= BENCHMARK =================
+def benchmark(paths, batch_size=BENCH_BATCH_SIZE):
+    """Compara a vazão (img/s) do caminho albumentations por imagem com o lote."""
+    import albumentations as A
+
+    # Pipeline original do gerar_dataset_v2.py, usado só como referência
+    bg_augment = A.Compose([
+        A.RandomBrightnessContrast(BRIGHTNESS_LIMIT, CONTRAST_LIMIT, p=P_BRIGHTNESS_CONTRAST),
+        A.ISONoise(color_shift=ISO_COLOR_SHIFT, intensity=ISO_INTENSITY, p=P_ISO_NOISE),
+        A.MotionBlur(blur_limit=BLUR_LIMIT, p=P_MOTION_BLUR),
+        A.RandomShadow(
+            shadow_roi=SHADOW_ROI,
+            num_shadows_lower=NUM_SHADOWS[0],
+            num_shadows_upper=NUM_SHADOWS[1],
+            shadow_dimension=SHADOW_VERTICES,
+            p=P_SHADOW
+        ),
+    ])
+
+    # Caminho antigo: RGBA -> RGB -> albumentations -> RGBA, uma por vez
+    start = time.perf_counter()
+    for p in paths:
+        bg = Image.open(p).convert("RGBA")
+        bg_np = np.array(bg.convert("RGB"))
+        bg_np = bg_augment(image=bg_np)["image"]
+        Image.fromarray(bg_np).convert("RGBA")
+    t_single = time.perf_counter() - start
+
+    # Caminho novo: RGB direto, lote em uint8 in-place, uma única conversão no final
+    start = time.perf_counter()
+    for i in range(0, len(paths), batch_size):
+        for bg_np in augment_batch(load_backgrounds(paths[i:i + batch_size])):
+            Image.fromarray(bg_np).convert("RGBA")
+    t_batch = time.perf_counter() - start
+
+    n = len(paths)
+    print(f"📊 {n} fundos | batch = {batch_size}")
+    print(f"Albumentations (por imagem): {n / t_single:8.1f} img/s")
+    print(f"Lote (augment_batch):        {n / t_batch:8.1f} img/s")
+    print(f"Speedup: {t_single / t_batch:.2f}x")
+    return n / t_single, n / t_batch
+
+
+if __name__ == "__main__":
+    bgs = [os.path.join(PATH_BGS, f) for f in os.listdir(PATH_BGS)]
+    if not bgs:
+        print("❌ Erro: verifique input_bgs.")
+    else:
+        benchmark([random.choice(bgs) for _ in range(BENCH_IMAGES)])
@@ -4,6 +4,8 @@ import numpy as np
 from PIL import Image
 import albumentations as A
 
+from scene_writer import SceneWriter
+
 # --- CONFIGURAÇÃO DE PASTAS ---
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 PATH_OBJS = os.path.join(BASE_DIR, "input_objs")
@@ -11,6 +13,8 @@ PATH_BGS = os.path.join(BASE_DIR, "input_bgs")
 PATH_OUT = os.path.join(BASE_DIR, "output")
 
 TOTAL_IMAGES = 500 
+WRITER_WORKERS = 4  # threads de encode/escrita em background
+SHARD_SIZE = 0      # > 0: empacota as cenas em shards .tar com esse nº de cenas
 
 # Pipeline preservando as cores originais (Azul/Preto)
 # Foco apenas em realismo ambiental (Luz e Nitidez)
@@ -32,32 +36,33 @@ def generate():
 
     print(f"🛠️  Gerando dataset para plataforma azul ({TOTAL_IMAGES} imagens)...")
 
-    for i in range(TOTAL_IMAGES):
-        bg = Image.open(os.path.join(PATH_BGS, random.choice(bgs))).convert("RGBA")
-        obj = Image.open(os.path.join(PATH_OBJS, random.choice(objs))).convert("RGBA")
+    with SceneWriter(PATH_OUT, workers=WRITER_WORKERS, shard_size=SHARD_SIZE) as writer:
+        for i in range(TOTAL_IMAGES):
+            bg = Image.open(os.path.join(PATH_BGS, random.choice(bgs))).convert("RGBA")
+            obj = Image.open(os.path.join(PATH_OBJS, random.choice(objs))).convert("RGBA")
 
-        # 1. Augmentation sem alterar matriz de cor (Hue)
-        obj_np = np.array(obj)
-        aug = transform_pipeline(image=obj_np[:, :, :3])["image"]
-        obj = Image.fromarray(np.dstack((aug, obj_np[:, :, 3])))
+            # 1. Augmentation sem alterar matriz de cor (Hue)
+            obj_np = np.array(obj)
+            aug = transform_pipeline(image=obj_np[:, :, :3])["image"]
+            obj = Image.fromarray(np.dstack((aug, obj_np[:, :, 3])))
 
-        # 2. Escala Dinâmica (Simula altitude do drone)
-        scale = random.uniform(0.1, 0.5) 
-        w, h = (int(bg.width * scale), int(bg.height * scale))
-        obj = obj.resize((w, h), Image.Resampling.LANCZOS)
+            # 2. Escala Dinâmica (Simula altitude do drone)
+            scale = random.uniform(0.1, 0.5) 
+            w, h = (int(bg.width * scale), int(bg.height * scale))
+            obj = obj.resize((w, h), Image.Resampling.LANCZOS)
         
-        # 3. Rotação (A plataforma pode estar em qualquer orientação no chão)
-        obj = obj.rotate(random.randint(0, 360), expand=True, resample=Image.BICUBIC)
+            # 3. Rotação (A plataforma pode estar em qualquer orientação no chão)
+            obj = obj.rotate(random.randint(0, 360), expand=True, resample=Image.BICUBIC)
 
-        # 4. Colagem
-        max_x, max_y = (bg.width - obj.width, bg.height - obj.height)
-        if max_x > 0 and max_y > 0:
-            pos_x, pos_y = (random.randint(0, max_x), random.randint(0, max_y))
-            bg.paste(obj, (pos_x, pos_y), obj)
+            # 4. Colagem
+            max_x, max_y = (bg.width - obj.width, bg.height - obj.height)
+            if max_x > 0 and max_y > 0:
+                pos_x, pos_y = (random.randint(0, max_x), random.randint(0, max_y))
+                bg.paste(obj, (pos_x, pos_y), obj)
 
-        # 5. Save para anotação no CVAT
-        filename = f"plataforma_azul_{i:04d}.jpg"
-        bg.convert("RGB").save(os.path.join(PATH_OUT, filename), "JPEG", quality=95)
+            # 5. Save para anotação no CVAT
+            filename = f"plataforma_azul_{i:04d}.jpg"
+            writer.write(filename, bg, quality=95)
 
     print(f"✅ Concluído! Imagens prontas para o CVAT em: {PATH_OUT}")
 
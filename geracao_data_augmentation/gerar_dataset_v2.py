@@ -1,8 +1,9 @@
 import os
 import random
-import numpy as np
 from PIL import Image, ImageFilter, ImageDraw
-import albumentations as A
+
+from augment_batch import augment_batch, load_backgrounds
+from scene_writer import SceneWriter
 
 # ================= CONFIG =================
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -15,20 +16,9 @@ MAX_OBJECTS_PER_IMAGE = 4
 MIN_SCALE = 0.08
 MAX_SCALE_LARGE_BG = 0.35
 MAX_SCALE_SMALL_BG = 0.25
-
-# ========== BACKGROUND AUGMENT ==========
-bg_augment = A.Compose([
-    A.RandomBrightnessContrast(0.25, 0.25, p=0.8),
-    A.ISONoise(color_shift=(0.01, 0.05), intensity=(0.2, 0.4), p=0.4),
-    A.MotionBlur(blur_limit=(3, 9), p=0.3),
-    A.RandomShadow(
-        shadow_roi=(0, 0.5, 1, 1),
-        num_shadows_lower=1,
-        num_shadows_upper=3,
-        shadow_dimension=6,
-        p=0.4
-    ),
-])
+BG_BATCH_SIZE = 16  # fundos carregados e aumentados por lote
+WRITER_WORKERS = 4  # threads de encode/escrita em background
+SHARD_SIZE = 0      # > 0: empacota as cenas em shards .tar com esse nº de cenas
 
 # ========== GEOMETRIA / COLISÃO ==========
 def intersects(box1, box2):
@@ -98,75 +88,74 @@ def generate():
 
     print(f"🛠 Gerando {TOTAL_IMAGES} imagens sintéticas...")
 
-    for i in range(TOTAL_IMAGES):
-        # ---------- BACKGROUND ----------
-        bg = Image.open(
-            os.path.join(PATH_BGS, random.choice(bgs))
-        ).convert("RGBA")
-
-        bg_np = np.array(bg.convert("RGB"))
-        bg_np = bg_augment(image=bg_np)["image"]
-        bg = Image.fromarray(bg_np).convert("RGBA")
-
-        placed_boxes = []
-        num_objects = random.randint(1, MAX_OBJECTS_PER_IMAGE)
-
-        # ---------- OBJECTS ----------
-        for _ in range(num_objects):
-            obj = Image.open(
-                os.path.join(PATH_OBJS, random.choice(objs))
-            ).convert("RGBA")
-
-            max_scale = (
-                MAX_SCALE_LARGE_BG
-                if bg.width > 1000 else
-                MAX_SCALE_SMALL_BG
-            )
-            scale = random.uniform(MIN_SCALE, max_scale)
-
-            w = int(bg.width * scale)
-            h = int(w * obj.height / obj.width)
-            obj = obj.resize((w, h), Image.Resampling.LANCZOS)
-
-            # compressão de perspectiva
-            if random.random() < 0.4:
-                obj = obj.resize(
-                    (obj.width, int(obj.height * random.uniform(0.75, 0.9))),
-                    Image.Resampling.BICUBIC
+    bg_batch = []
+    with SceneWriter(PATH_OUT, workers=WRITER_WORKERS, shard_size=SHARD_SIZE) as writer:
+        for i in range(TOTAL_IMAGES):
+            # ---------- BACKGROUND ----------
+            if not bg_batch:
+                n = min(BG_BATCH_SIZE, TOTAL_IMAGES - i)
+                bg_batch = augment_batch(load_backgrounds([
+                    os.path.join(PATH_BGS, random.choice(bgs))
+                    for _ in range(n)
+                ]))
+
+            bg = Image.fromarray(bg_batch.pop(0)).convert("RGBA")
+
+            placed_boxes = []
+            num_objects = random.randint(1, MAX_OBJECTS_PER_IMAGE)
+
+            # ---------- OBJECTS ----------
+            for _ in range(num_objects):
+                obj = Image.open(
+                    os.path.join(PATH_OBJS, random.choice(objs))
+                ).convert("RGBA")
+
+                max_scale = (
+                    MAX_SCALE_LARGE_BG
+                    if bg.width > 1000 else
+                    MAX_SCALE_SMALL_BG
+                )
+                scale = random.uniform(MIN_SCALE, max_scale)
+
+                w = int(bg.width * scale)
+                h = int(w * obj.height / obj.width)
+                obj = obj.resize((w, h), Image.Resampling.LANCZOS)
+
+                # compressão de perspectiva
+                if random.random() < 0.4:
+                    obj = obj.resize(
+                        (obj.width, int(obj.height * random.uniform(0.75, 0.9))),
+                        Image.Resampling.BICUBIC
+                    )
+
+                obj = obj.rotate(
+                    random.randint(0, 360),
+                    expand=True,
+                    resample=Image.BICUBIC
                 )
 
-            obj = obj.rotate(
-                random.randint(0, 360),
-                expand=True,
-                resample=Image.BICUBIC
-            )
-
-            pos, bbox = find_valid_position(
-                (bg.width, bg.height),
-                (obj.width, obj.height),
-                placed_boxes
-            )
-
-            if pos is None:
-                continue
-
-            if random.random() < 0.6:
-                add_shadow(bg, obj, pos)
-
-            bg.paste(obj, pos, obj)
-            placed_boxes.append(bbox)
-
-        # ---------- OCLUSÃO FINAL ----------
-        if random.random() < 0.3:
-            random_occlusion(bg)
-
-        # ---------- SAVE ----------
-        filename = f"scene_{i:04d}.jpg"
-        bg.convert("RGB").save(
-            os.path.join(PATH_OUT, filename),
-            "JPEG",
-            quality=random.randint(85, 95)
-        )
+                pos, bbox = find_valid_position(
+                    (bg.width, bg.height),
+                    (obj.width, obj.height),
+                    placed_boxes
+                )
+
+                if pos is None:
+                    continue
+
+                if random.random() < 0.6:
+                    add_shadow(bg, obj, pos)
+
+                bg.paste(obj, pos, obj)
+                placed_boxes.append(bbox)
+
+            # ---------- OCLUSÃO FINAL ----------
+            if random.random() < 0.3:
+                random_occlusion(bg)
+
+            # ---------- SAVE ----------
+            filename = f"scene_{i:04d}.jpg"
+            writer.write(filename, bg, quality=random.randint(85, 95))
 
     print(f"✅ Dataset final salvo em: {PATH_OUT}")
 
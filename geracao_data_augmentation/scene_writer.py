@@ -0,0 +1,191 @@
+import io
+import os
+import json
+import queue
+import tarfile
+import threading
+
+# ================= CONFIG =================
+DEFAULT_WORKERS = 4
+DEFAULT_QUEUE_SIZE = 64
+SHARD_PATTERN = "shard_{:05d}.tar"
+INDEX_NAME = "index.json"
+
+_STOP = object()
+
+
+class SceneWriter:
+    """
+    Estágio de saída assíncrono para as cenas geradas.
+
+    O encode JPEG e a escrita saem do loop de composição: cada `write` só
+    enfileira a imagem e um pool de threads faz o encode em paralelo. No
+    máximo `queue_size` cenas ficam em trânsito (na fila, no encode ou
+    esperando a escrita); acima disso o gerador espera, mesmo que o disco
+    seja o gargalo. Uma única thread de escrita
+    grava os resultados na ordem em que `write` foi chamado, então a saída é
+    reproduzível. Com `shard_size > 0` os pares imagem/label são empacotados
+    em tars sequenciais (`shard_00000.tar`, ...) com um `index.json`
+    apontando shard e offset de cada arquivo.
+
+    Use como context manager: em erro ou Ctrl+C o `close` ainda grava o que
+    já está na fila, fecha o tar e escreve o índice.
+    """
+
+    def __init__(self, out_dir, workers=DEFAULT_WORKERS, queue_size=DEFAULT_QUEUE_SIZE, shard_size=0):
+        self.out_dir = out_dir
+        self.shard_size = shard_size
+        os.makedirs(out_dir, exist_ok=True)
+
+        self._queue = queue.Queue()
+        # Vagas de cenas em trânsito: pega no `write`, devolve depois de gravar
+        self._slots = threading.BoundedSemaphore(max(1, queue_size))
+        self._errors = []
+        self._closed = False
+
+        # Resultados do encode aguardando a vez de serem gravados (por seq)
+        self._cond = threading.Condition()
+        self._encoded = {}
+        self._submitted = 0
+        self._encoders_done = False
+
+        # Estado dos shards (só a thread de escrita mexe)
+        self._tar = None
+        self._shard_id = -1
+        self._shard_count = 0
+        self._index = []
+
+        self._encoders = [
+            threading.Thread(target=self._encode_worker, daemon=True)
+            for _ in range(max(1, workers))
+        ]
+        self._writer = threading.Thread(target=self._write_worker, daemon=True)
+        for t in self._encoders + [self._writer]:
+            t.start()
+
+    # ---------- API ----------
+    def write(self, filename, image, quality=95, label=None):
+        """Enfileira uma cena (PIL). `label` é o texto YOLO opcional."""
+        if self._errors:
+            self.close()  # encerra o pool e relança o primeiro erro
+        self._slots.acquire()
+        self._queue.put((self._submitted, filename, image, quality, label))
+        self._submitted += 1
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+
+        for _ in self._encoders:
+            self._queue.put(_STOP)
+        for t in self._encoders:
+            t.join()
+
+        with self._cond:
+            self._encoders_done = True
+            self._cond.notify_all()
+        self._writer.join()
+
+        self._close_shard()
+        if self.shard_size > 0:
+            with open(os.path.join(self.out_dir, INDEX_NAME), "w") as f:
+                json.dump(self._index, f, indent=2)
+
+        if self._errors:
+            raise self._errors[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # ---------- ENCODE (paralelo) ----------
+    def _encode_worker(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            seq, filename, image, quality, label = item
+            try:
+                # O PIL libera o GIL durante o encode
+                buf = io.BytesIO()
+                image.convert("RGB").save(buf, "JPEG", quality=quality)
+                result = (filename, buf.getvalue(), label)
+            except Exception as e:
+                self._errors.append(e)
+                result = None  # a thread de escrita pula esta seq
+
+            with self._cond:
+                self._encoded[seq] = result
+                self._cond.notify_all()
+
+    # ---------- ESCRITA (sequencial) ----------
+    def _write_worker(self):
+        seq = 0
+        while True:
+            with self._cond:
+                while seq not in self._encoded:
+                    if self._encoders_done and seq >= self._submitted:
+                        return
+                    self._cond.wait()
+                result = self._encoded.pop(seq)
+            seq += 1
+
+            try:
+                if result is not None:
+                    self._store(*result)
+            except Exception as e:
+                self._errors.append(e)
+            finally:
+                self._slots.release()
+
+    def _store(self, filename, data, label):
+        stem = os.path.splitext(filename)[0]
+        label_name = f"{stem}.txt"
+
+        if self.shard_size <= 0:
+            with open(os.path.join(self.out_dir, filename), "wb") as f:
+                f.write(data)
+            if label is not None:
+                with open(os.path.join(self.out_dir, label_name), "w") as f:
+                    f.write(label)
+            return
+
+        if self._tar is None or self._shard_count >= self.shard_size:
+            self._open_next_shard()
+
+        entry = {
+            "key": stem,
+            "shard": SHARD_PATTERN.format(self._shard_id),
+            "image": self._add_member(filename, data),
+        }
+        if label is not None:
+            entry["label"] = self._add_member(label_name, label.encode())
+
+        self._index.append(entry)
+        self._shard_count += 1
+
+    # ---------- SHARDS ----------
+    def _open_next_shard(self):
+        self._close_shard()
+        self._shard_id += 1
+        self._shard_count = 0
+        path = os.path.join(self.out_dir, SHARD_PATTERN.format(self._shard_id))
+        self._tar = tarfile.open(path, "w")
+
+    def _close_shard(self):
+        if self._tar is not None:
+            self._tar.close()
+            self._tar = None
+
+    def _add_member(self, name, data):
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        self._tar.addfile(info, io.BytesIO(data))
+
+        # Offset dos dados (após o header) para ler direto do tar com seek
+        padded = -(-info.size // tarfile.BLOCKSIZE) * tarfile.BLOCKSIZE
+        offset = self._tar.offset - padded
+        return {"name": name, "offset": offset, "size": info.size}
@@ -0,0 +1,184 @@
+import os
+import csv
+import json
+import time
+
+import torch
+
+try:
+    import psutil
+except ImportError:  # opcional: sem psutil usa os.times()
+    psutil = None
+
+try:
+    import resource
+except ImportError:  # não existe no Windows
+    resource = None
+
+# Fração do tempo da época esperando o dataloader acima da qual
+# consideramos o treino "faminto" de dados (aumente WORKERS)
+STARVATION_THRESHOLD = 0.30
+TIMELINE_NAME = 'throughput'
+RSS_SAMPLE_EVERY = 10  # batches entre amostras de RSS (processo + workers)
+
+
+class ThroughputMonitor:
+    """
+    Instrumentação de vazão do treino via callbacks da Ultralytics.
+
+    Por época mede: espera no dataloader vs forward/backward, imagens/s,
+    pico de RSS e de memória da GPU (se houver) e uso de CPU. Salva
+    `throughput.csv` e `throughput.json` no diretório do run.
+
+    Com psutil o pico de RSS é amostrado durante a época, somando o processo
+    e os workers do dataloader. Sem psutil cai no `ru_maxrss`, que é o pico
+    do processo principal desde o início (não por época).
+    """
+
+    def __init__(self, threshold=STARVATION_THRESHOLD, timer=time.perf_counter):
+        self.threshold = threshold
+        self.timer = timer
+        self.cuda = torch.cuda.is_available()
+        self.timeline = []
+        self._proc = psutil.Process() if psutil else None
+
+    def register(self, model):
+        model.add_callback('on_train_epoch_start', self.on_train_epoch_start)
+        model.add_callback('on_train_batch_start', self.on_train_batch_start)
+        model.add_callback('on_train_batch_end', self.on_train_batch_end)
+        model.add_callback('on_train_epoch_end', self.on_train_epoch_end)
+        model.add_callback('on_train_end', self.on_train_end)
+        return self
+
+    # ---------- CALLBACKS ----------
+    def on_train_epoch_start(self, trainer):
+        self._data_wait = 0.0
+        self._compute = 0.0
+        self._batches = 0
+        self._epoch_start = self.timer()
+        self._last_end = self._epoch_start
+        self._cpu_start = self._cpu_time()
+        self._rss_peak = self._sample_rss()
+
+        if self.cuda:
+            torch.cuda.reset_peak_memory_stats()
+
+    def on_train_batch_start(self, trainer):
+        now = self.timer()
+        self._data_wait += now - self._last_end
+        self._batch_start = now
+
+    def on_train_batch_end(self, trainer):
+        # Sem sincronizar, o tempo da GPU vazaria para a "espera" do próximo batch
+        if self.cuda:
+            torch.cuda.synchronize()
+        now = self.timer()
+        self._compute += now - self._batch_start
+        self._batches += 1
+
+        if self._batches % RSS_SAMPLE_EVERY == 0:
+            self._update_rss()
+            now = self.timer()  # a amostragem não conta como espera
+        self._last_end = now
+
+    def on_train_epoch_end(self, trainer):
+        wall = self.timer() - self._epoch_start
+        self._update_rss()
+        images = self._batches * trainer.batch_size
+        dataset = getattr(getattr(trainer, 'train_loader', None), 'dataset', None)
+        if dataset is not None:
+            images = min(images, len(dataset))
+
+        cpu_count = os.cpu_count() or 1
+        cpu_percent = 100.0 * (self._cpu_time() - self._cpu_start) / (wall * cpu_count)
+
+        row = {
+            'epoch': trainer.epoch + 1,
+            'wall_s': round(wall, 3),
+            'data_wait_s': round(self._data_wait, 3),
+            'compute_s': round(self._compute, 3),
+            'data_wait_frac': round(self._data_wait / wall, 4) if wall else 0.0,
+            'images': images,
+            'images_per_s': round(images / wall, 2) if wall else 0.0,
+            'peak_rss_mb': round(self._rss_peak, 1) if self._rss_peak is not None else None,
+            'gpu_peak_mb': round(torch.cuda.max_memory_allocated() / 2**20, 1) if self.cuda else None,
+            'cpu_percent': round(cpu_percent, 1),
+        }
+        self.timeline.append(row)
+        self.save(trainer.save_dir)
+
+    def on_train_end(self, trainer):
+        summary = self.save(trainer.save_dir)
+        if summary is None:
+            return
+
+        print(f"\n--- VAZÃO DO TREINO ({summary['epochs']} épocas) ---")
+        print(f"Imagens/s (média): {summary['mean_images_per_s']}")
+        print(f"Espera no dataloader: {summary['mean_data_wait_frac']:.0%} do tempo")
+        if summary['data_starved']:
+            print("AVISO: treino limitado pelo carregamento de dados. Considere aumentar WORKERS.")
+
+    # ---------- SAÍDA ----------
+    def summary(self):
+        if not self.timeline:
+            return None
+        n = len(self.timeline)
+        wait = sum(r['data_wait_frac'] for r in self.timeline) / n
+        return {
+            'epochs': n,
+            'mean_images_per_s': round(sum(r['images_per_s'] for r in self.timeline) / n, 2),
+            'mean_data_wait_frac': round(wait, 4),
+            'peak_rss_mb': max((r['peak_rss_mb'] or 0) for r in self.timeline),
+            'gpu_peak_mb': max((r['gpu_peak_mb'] or 0) for r in self.timeline) if self.cuda else None,
+            'starvation_threshold': self.threshold,
+            'data_starved': wait > self.threshold,
+        }
+
+    def save(self, save_dir):
+        summary = self.summary()
+        if summary is None:
+            return None
+
+        with open(os.path.join(save_dir, f'{TIMELINE_NAME}.csv'), 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(self.timeline[0]))
+            writer.writeheader()
+            writer.writerows(self.timeline)
+
+        with open(os.path.join(save_dir, f'{TIMELINE_NAME}.json'), 'w') as f:
+            json.dump({'summary': summary, 'epochs': self.timeline}, f, indent=2)
+
+        return summary
+
+    # ---------- MÉTRICAS DO PROCESSO ----------
+    def _cpu_time(self):
+        if self._proc:
+            # Inclui os workers do dataloader ainda vivos (processos filhos)
+            total = sum(self._proc.cpu_times()[:2])
+            for child in self._proc.children(recursive=True):
+                try:
+                    total += sum(child.cpu_times()[:2])
+                except psutil.Error:
+                    pass
+            return total
+        t = os.times()
+        return t.user + t.system + t.children_user + t.children_system
+
+    def _update_rss(self):
+        rss = self._sample_rss()
+        if rss is not None:
+            self._rss_peak = max(self._rss_peak or 0.0, rss)
+
+    def _sample_rss(self):
+        """RSS atual (MB) do processo + filhos com psutil; senão o pico do processo."""
+        if self._proc:
+            total = self._proc.memory_info().rss
+            for child in self._proc.children(recursive=True):
+                try:
+                    total += child.memory_info().rss
+                except psutil.Error:
+                    pass
+            return total / 2**20
+        if resource:
+            # ru_maxrss é em KB no Linux
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        return None
@@ -1,20 +1,75 @@
 from ultralytics import YOLO
 import cv2
 
-# 1. Carrega o modelo
-model = YOLO('plataforma_voo_v1.pt')
-
-# 2. Testa se a câmera abre antes de rodar o YOLO
-cap = cv2.VideoCapture(0)
-if not cap.isOpened():
-    print("❌ Erro: Não consegui acessar a Logitech Brio. Verifique o cabo ou se outra aba (Chrome/Discord) está usando a câmera.")
-else:
-    print("✅ Câmera detectada! Iniciando inferência...")
-    cap.release() # Fecha o teste para o YOLO assumir
-
-# 3. Roda a detecção com loop manual (mais estável para debug)
-results = model.predict(source="2", show=True, stream=True, conf=0.9)
-
-for r in results:
-    # Este loop mantém o programa vivo enquanto houver frames
-    pass
+from scheduler import MotionGatedScheduler, MIN_INFER_FPS, MAX_INFER_FPS
+
+MODEL_PATH = 'plataforma_voo_v1.pt'
+SOURCE = "2"
+CONF = 0.9
+GATED = True  # pula a inferência quando a cena não muda (economiza CPU na Pi)
+METRICS_EVERY = 5.0  # segundos entre os prints de métricas do agendador
+
+def run_gated(model, source, conf, min_fps=MIN_INFER_FPS, max_fps=MAX_INFER_FPS):
+    # Loop manual: o agendador decide quando rodar o YOLO e quando reaproveitar
+    cap = cv2.VideoCapture(int(source) if str(source).isdigit() else source)
+    scheduler = MotionGatedScheduler(min_fps=min_fps, max_fps=max_fps)
+    infer = lambda frame: model.predict(frame, conf=conf, verbose=False)[0]
+    last_print = cv2.getTickCount()
+
+    try:
+        while True:
+            ok, frame = cap.read()
+            if not ok:
+                break
+
+            result, fresh = scheduler.step(frame, infer)
+            view = result.plot(img=frame)
+
+            m = scheduler.metrics()
+            status = "infer" if fresh else "reuso"
+            cv2.putText(view, f"{status} | infer {m['infer_fps']:.1f} fps | cam {m['camera_fps']:.1f} fps",
+                        (10, 25), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
+            cv2.imshow("DeltaV", view)
+            if cv2.waitKey(1) & 0xFF == ord('q'):
+                break
+
+            if (cv2.getTickCount() - last_print) / cv2.getTickFrequency() >= METRICS_EVERY:
+                last_print = cv2.getTickCount()
+                print(f"📊 infer {m['infer_fps']:.1f} fps | pulados {m['skip_rate']:.0%} | "
+                      f"CPU {m['cpu_percent']:.0f}% | atraso médio {m['staleness_mean_ms']:.0f} ms")
+    finally:
+        cap.release()
+        cv2.destroyAllWindows()
+
+    m = scheduler.metrics()
+    print("\n--- AGENDADOR ---")
+    print(f"Frames: {m['frames']} | Inferências: {m['inferences']} ({m['skip_rate']:.0%} puladas)")
+    print(f"FPS efetivo de inferência: {m['infer_fps']:.1f} (câmera: {m['camera_fps']:.1f})")
+    print(f"CPU economizada (estimada): {m['est_saved_s']:.1f} s | Uso de CPU: {m['cpu_percent']:.0f}%")
+    print(f"Atraso das detecções reaproveitadas: médio {m['staleness_mean_ms']:.0f} ms, máx {m['staleness_max_ms']:.0f} ms")
+    return m
+
+def run_inference(model_path=MODEL_PATH, source=SOURCE, conf=CONF, gated=GATED):
+    # 1. Carrega o modelo
+    model = YOLO(model_path)
+
+    # 2. Testa se a câmera abre antes de rodar o YOLO
+    cap = cv2.VideoCapture(0)
+    if not cap.isOpened():
+        print("❌ Erro: Não consegui acessar a Logitech Brio. Verifique o cabo ou se outra aba (Chrome/Discord) está usando a câmera.")
+    else:
+        print("✅ Câmera detectada! Iniciando inferência...")
+        cap.release() # Fecha o teste para o YOLO assumir
+
+    if gated:
+        return run_gated(model, source, conf)
+
+    # 3. Roda a detecção com loop manual (mais estável para debug)
+    results = model.predict(source=source, show=True, stream=True, conf=conf)
+
+    for r in results:
+        # Este loop mantém o programa vivo enquanto houver frames
+        pass
+
+if __name__ == "__main__":
+    run_inference()
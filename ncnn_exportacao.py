@@ -1,10 +1,15 @@
-from ultralytics import YOLO
+from export_cache import cached_export
 
-# 1. Carrega o seu treino original
-model = YOLO('best.pt')
+WEIGHTS = 'best.pt'
+IMG_SIZE = 320
+OPSET = 12
 
+def export_ncnn(weights=WEIGHTS):
+    # Exporta para NCNN (FP16). Se o mesmo .pt já foi exportado com esses
+    # argumentos, a pasta vem direto do cache (.export_cache/) e é copiada
+    # para ao lado do .pt (best_ncnn_model/)
+    return cached_export(weights, format='ncnn', imgsz=IMG_SIZE, half=True, opset=OPSET, simplify=True)['output']
 
-# Isso faz internamente: PT -> ONNX -> NCNN (FP16)
-model.export(format='ncnn', imgsz=320, half=True, opset = 12, simplify = True)
-
-print("Pronto. Pegue a pasta 'best_ncnn_model' e coloque na Raspberry Pi.")
\ No newline at end of file
+if __name__ == '__main__':
+    path = export_ncnn()
+    print(f"Pronto. Pegue a pasta '{path}' e coloque na Raspberry Pi.")
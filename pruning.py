@@ -0,0 +1,266 @@
+import os
+import csv
+import copy
+import json
+import math
+import time
+
+import torch
+import torch.nn as nn
+from ultralytics import YOLO
+from ultralytics.models.yolo.detect import DetectionTrainer
+from ultralytics.nn.modules import Bottleneck, Conv, Detect
+
+from train import IMG_SIZE, WORKERS, load_best_params
+from pt_para_onnx import export_onnx, IMG_SIZE as EXPORT_IMG_SIZE
+from ncnn_exportacao import export_ncnn
+
+WEIGHTS = 'best.pt'
+PROJECT_NAME = 'DeltaV_Pruning'
+PRUNE_RATIOS = [0.0, 0.2, 0.35, 0.5]  # fração de FLOPs a remover (0.0 = baseline, também com fine-tune)
+FINETUNE_EPOCHS = 30
+MIN_CHANNELS = 8       # nenhuma camada fica com menos canais que isso
+MIN_KEEP_RATIO = 0.25  # nem com menos que essa fração dos canais originais
+LATENCY_RUNS = 30
+
+
+# ========== GRUPOS PODÁVEIS ==========
+def find_prunable_groups(model):
+    """
+    Pares (produtor, consumidores) em que os canais de saída do produtor só
+    alimentam os consumidores, então podem ser removidos fisicamente sem
+    mexer em concats/residuais:
+      * Bottleneck: cv1 -> cv2 (a saída do cv2 soma no residual, não é podada)
+      * Detect: convs intermediárias da cabeça de box (cv2) e a última conv
+        da cabeça de classe (cv3) antes do Conv2d final
+    """
+    groups = []
+    for m in model.modules():
+        if isinstance(m, Bottleneck):
+            groups.append((m.cv1, [m.cv2.conv]))
+        elif isinstance(m, Detect):
+            for box in m.cv2:
+                groups.append((box[0], [box[1].conv]))
+                groups.append((box[1], [box[2]]))
+            for cls in m.cv3:
+                last = cls[-2]
+                last = last[-1] if isinstance(last, nn.Sequential) else last
+                if isinstance(last, Conv):
+                    groups.append((last, [cls[-1]]))
+
+    return [
+        (producer, consumers) for producer, consumers in groups
+        if all(c.groups == 1 for c in consumers)
+    ]
+
+
+def channel_scores(groups):
+    """|gamma| do BN normalizado pela média da camada (network slimming)."""
+    scores = []
+    for producer, _ in groups:
+        gamma = producer.bn.weight.detach().abs()
+        scores.append(gamma / gamma.mean().clamp(min=1e-12))
+    return scores
+
+
+def plan_pruning(groups, n_prune):
+    """Escolhe os `n_prune` canais de menor score global, respeitando o mínimo por camada."""
+    scores = channel_scores(groups)
+    candidates = []
+    for g, s in enumerate(scores):
+        n = len(s)
+        removable = n - max(MIN_CHANNELS, math.ceil(n * MIN_KEEP_RATIO))
+        if removable <= 0:
+            continue
+        order = torch.argsort(s)[:removable]
+        candidates.extend((s[c].item(), g, c.item()) for c in order)
+    candidates.sort()
+
+    drop = {}
+    for _, g, c in candidates[:n_prune]:
+        drop.setdefault(g, set()).add(c)
+
+    plan = {}
+    for g, d in drop.items():
+        n = len(scores[g])
+        plan[g] = torch.tensor([c for c in range(n) if c not in d], dtype=torch.long)
+    return plan, len(candidates)
+
+
+# ========== REMOÇÃO FÍSICA ==========
+def prune_out_channels(conv, keep):
+    c, bn = conv.conv, conv.bn
+    c.weight = nn.Parameter(c.weight.data[keep].clone())
+    if c.bias is not None:
+        c.bias = nn.Parameter(c.bias.data[keep].clone())
+    c.out_channels = len(keep)
+
+    bn.weight = nn.Parameter(bn.weight.data[keep].clone())
+    bn.bias = nn.Parameter(bn.bias.data[keep].clone())
+    bn.running_mean = bn.running_mean[keep].clone()
+    bn.running_var = bn.running_var[keep].clone()
+    bn.num_features = len(keep)
+
+
+def prune_in_channels(conv2d, keep):
+    conv2d.weight = nn.Parameter(conv2d.weight.data[:, keep].clone())
+    conv2d.in_channels = len(keep)
+
+
+def apply_pruning(model, n_prune):
+    """Retorna uma cópia do modelo com os `n_prune` canais menos importantes removidos."""
+    pruned = copy.deepcopy(model)
+    groups = find_prunable_groups(pruned)
+    plan, _ = plan_pruning(groups, n_prune)
+    for g, keep in plan.items():
+        producer, consumers = groups[g]
+        prune_out_channels(producer, keep)
+        for consumer in consumers:
+            prune_in_channels(consumer, keep)
+    return pruned
+
+
+# ========== MÉTRICAS ==========
+def count_flops(model, imgsz=EXPORT_IMG_SIZE):
+    """GFLOPs das convoluções (2 * MACs), sem depender do thop."""
+    total = [0]
+
+    def hook(m, inputs, output):
+        k = m.kernel_size[0] * m.kernel_size[1]
+        total[0] += 2 * output.numel() * (m.in_channels // m.groups) * k
+
+    handles = [m.register_forward_hook(hook) for m in model.modules() if isinstance(m, nn.Conv2d)]
+    model.eval()
+    with torch.no_grad():
+        model(torch.zeros(1, 3, imgsz, imgsz, device=next(model.parameters()).device))
+    for h in handles:
+        h.remove()
+    return total[0] / 1e9
+
+
+def measure_latency(model, imgsz=EXPORT_IMG_SIZE, runs=LATENCY_RUNS):
+    """Mediana (ms) de inferência em CPU, no tamanho de exportação."""
+    model = copy.deepcopy(model).float().cpu().eval()
+    x = torch.zeros(1, 3, imgsz, imgsz)
+    times = []
+    with torch.no_grad():
+        for i in range(runs + 5):
+            start = time.perf_counter()
+            model(x)
+            if i >= 5:  # aquecimento
+                times.append((time.perf_counter() - start) * 1000)
+    times.sort()
+    return times[len(times) // 2]
+
+
+def search_prune_count(model, ratio):
+    """Busca binária do nº de canais a remover para cortar `ratio` dos FLOPs."""
+    base = count_flops(model)
+    target = base * (1 - ratio)
+    _, max_prune = plan_pruning(find_prunable_groups(model), 0)
+
+    lo, hi = 0, max_prune
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if count_flops(apply_pruning(model, mid)) <= target:
+            hi = mid
+        else:
+            lo = mid + 1
+
+    if count_flops(apply_pruning(model, lo)) > target:
+        print(f"AVISO: só foi possível podar até {lo} canais para o ratio {ratio}.")
+    return lo
+
+
+# ========== FINE-TUNE ==========
+def make_trainer(model):
+    # O train() da Ultralytics reconstrói o modelo a partir do yaml, o que
+    # descartaria os pesos podados (shapes diferentes). Forçamos o modelo podado.
+    class PrunedTrainer(DetectionTrainer):
+        def get_model(self, cfg=None, weights=None, verbose=True):
+            return model
+
+    return PrunedTrainer
+
+
+def finetune(weights, model, ratio, data, best_params):
+    yolo = YOLO(weights)
+    yolo.model = model
+    yolo.train(
+        trainer=make_trainer(model),
+        data=data,
+        epochs=FINETUNE_EPOCHS,
+        imgsz=IMG_SIZE,
+        batch=5,
+        device=0 if torch.cuda.is_available() else 'cpu',
+        workers=WORKERS,
+        project=PROJECT_NAME,
+        name=f'prune_{int(ratio * 100):02d}',
+        cos_lr=True,
+        optimizer='AdamW',
+        **best_params
+    )
+    return str(yolo.trainer.best)
+
+
+def evaluate(weights, data, imgsz=EXPORT_IMG_SIZE):
+    # Mesmo tamanho dos FLOPs, da latência e dos artefatos exportados
+    metrics = YOLO(weights).val(data=data, imgsz=imgsz, plots=False)
+    return metrics.box.map50, metrics.box.map
+
+
+# ================= MAIN =================
+def run_pruning():
+    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+    DATASET_PATH = os.path.join(BASE_DIR, 'dataset_para_treino', 'data.yaml')
+
+    print("--- PODA DE CANAIS (BN scaling) ---")
+    best_params = load_best_params(BASE_DIR)
+    base_model = YOLO(WEIGHTS).model.float()
+    base_flops = count_flops(base_model)
+
+    curve = []
+    for ratio in PRUNE_RATIOS:
+        print(f"\n--- RATIO {ratio:.0%} ---")
+
+        # O baseline (0%) passa pelo mesmo fine-tune, para que a curva compare
+        # só o efeito da poda e não o das épocas extras
+        n_prune = search_prune_count(base_model, ratio) if ratio > 0 else 0
+        model = apply_pruning(base_model, n_prune)
+        weights = finetune(WEIGHTS, model, ratio, DATASET_PATH, best_params)
+
+        model = YOLO(weights).model.float()
+        map50, map50_95 = evaluate(weights, DATASET_PATH)
+        flops = count_flops(model)
+
+        curve.append({
+            'ratio': ratio,
+            'imgsz': EXPORT_IMG_SIZE,
+            'pruned_channels': n_prune,
+            'gflops': round(flops, 3),
+            'flops_ratio': round(flops / base_flops, 3),
+            'latency_ms_cpu': round(measure_latency(model), 2),
+            'map50': round(float(map50), 4),
+            'map50_95': round(float(map50_95), 4),
+            'weights': weights,
+            'finetune_epochs': FINETUNE_EPOCHS,
+            'onnx': export_onnx(weights),
+            'ncnn': export_ncnn(weights),
+        })
+
+    os.makedirs(PROJECT_NAME, exist_ok=True)
+    with open(os.path.join(PROJECT_NAME, 'pruning_curve.csv'), 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(curve[0]))
+        writer.writeheader()
+        writer.writerows(curve)
+    with open(os.path.join(PROJECT_NAME, 'pruning_curve.json'), 'w') as f:
+        json.dump(curve, f, indent=2)
+
+    print("\n--- CURVA FLOPs / LATÊNCIA / mAP ---")
+    print(f"{'ratio':>6} {'GFLOPs':>8} {'ms (CPU)':>9} {'mAP50':>7} {'mAP50-95':>9}")
+    for r in curve:
+        print(f"{r['ratio']:>6.0%} {r['gflops']:>8.2f} {r['latency_ms_cpu']:>9.2f} {r['map50']:>7.3f} {r['map50_95']:>9.3f}")
+    print(f"\nResultados em: {os.path.abspath(PROJECT_NAME)}")
+
+if __name__ == '__main__':
+    run_pruning()
@@ -1,8 +1,14 @@
-from ultralytics import YOLO
+from export_cache import cached_export
 
-# Carrega o .pt original
-model = YOLO('best.pt')
+WEIGHTS = 'best.pt'
+IMG_SIZE = 320
+OPSET = 12
 
-# Exporta com SIMPLIFY=TRUE (Isso limpa operações inúteis do grafo)
-# Isso é OBRIGATÓRIO para ter boa performance no NCNN depois
-model.export(format='onnx', imgsz=320, opset=12, simplify=True)
\ No newline at end of file
+def export_onnx(weights=WEIGHTS):
+    # Exporta com SIMPLIFY=TRUE (Isso limpa operações inúteis do grafo)
+    # Isso é OBRIGATÓRIO para ter boa performance no NCNN depois
+    # Se o mesmo .pt já foi exportado com esses argumentos, vem direto do cache
+    return cached_export(weights, format='onnx', imgsz=IMG_SIZE, opset=OPSET, simplify=True)['output']
+
+if __name__ == '__main__':
+    print(export_onnx())
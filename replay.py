@@ -0,0 +1,280 @@
+import os
+import time
+import struct
+
+import numpy as np
+import cv2
+
+# ================= CONFIG =================
+MAGIC = b'DVREC1\n'
+RECORD = struct.Struct('<dI')  # timestamp (s), tamanho do JPEG
+JPEG_QUALITY = 90
+IOU_MATCH = 0.5
+
+
+# ========== ARQUIVO DE GRAVAÇÃO ==========
+class FrameRecorder:
+    """
+    Grava frames BGR com timestamp num arquivo compacto (JPEGs em sequência).
+    Serve para a câmera (`record`) e para controladores do Webots, que podem
+    chamar `add` com o array de `camera.getImage()` já convertido para BGR.
+    """
+
+    def __init__(self, path, quality=JPEG_QUALITY):
+        self.quality = quality
+        self.count = 0
+        self._f = open(path, 'wb')
+        self._f.write(MAGIC)
+        self._t0 = None
+
+    def add(self, frame, timestamp=None):
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        if self._t0 is None:
+            self._t0 = timestamp
+
+        ok, buf = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+        if not ok:
+            raise RuntimeError("Falha ao codificar o frame em JPEG.")
+        data = buf.tobytes()
+        self._f.write(RECORD.pack(timestamp - self._t0, len(data)))
+        self._f.write(data)
+        self.count += 1
+
+    def close(self):
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class Recording:
+    """
+    Gravação aberta para leitura sob demanda.
+
+    Na abertura só os timestamps e offsets são lidos; cada frame é
+    decodificado quando pedido, então a memória não cresce com a duração.
+    A leitura para no primeiro registro truncado ou sem JPEG completo (caso
+    o gravador tenha sido morto sem `close`).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.timestamps = []
+        self._offsets = []
+        self._f = open(path, 'rb')
+
+        if self._f.read(len(MAGIC)) != MAGIC:
+            self._f.close()
+            raise ValueError(f"'{path}' não é uma gravação válida.")
+
+        end = os.fstat(self._f.fileno()).st_size
+        pos = len(MAGIC)
+        while pos + RECORD.size <= end:
+            self._f.seek(pos)
+            ts, size = RECORD.unpack(self._f.read(RECORD.size))
+            data_pos = pos + RECORD.size
+            if data_pos + size > end or not self._complete_jpeg(data_pos, size):
+                break
+            self.timestamps.append(ts)
+            self._offsets.append((data_pos, size))
+            pos = data_pos + size
+
+    def _complete_jpeg(self, pos, size):
+        if size < 4:
+            return False
+        self._f.seek(pos)
+        soi = self._f.read(2)
+        self._f.seek(pos + size - 2)
+        return soi == b'\xff\xd8' and self._f.read(2) == b'\xff\xd9'
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def frame(self, i):
+        """Decodifica o frame `i` (BGR). Retorna None se o JPEG não decodificar."""
+        pos, size = self._offsets[i]
+        self._f.seek(pos)
+        data = np.frombuffer(self._f.read(size), dtype=np.uint8)
+        return cv2.imdecode(data, cv2.IMREAD_COLOR)
+
+    def close(self):
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def load_recording(path):
+    return Recording(path)
+
+
+def record(source, out_path, duration=None, max_frames=None):
+    """Grava da câmera (índice) ou de um vídeo/stream até Ctrl+C, `duration` ou `max_frames`."""
+    cap = cv2.VideoCapture(int(source) if str(source).isdigit() else source)
+    if not cap.isOpened():
+        print(f"❌ Erro: não consegui abrir a fonte '{source}'.")
+        return 0
+
+    print(f"🔴 Gravando '{source}' em {out_path} (Ctrl+C para parar)...")
+    start = time.perf_counter()
+    with FrameRecorder(out_path) as rec:
+        try:
+            while True:
+                ok, frame = cap.read()
+                if not ok:
+                    break
+                rec.add(frame)
+                if max_frames and rec.count >= max_frames:
+                    break
+                if duration and time.perf_counter() - start >= duration:
+                    break
+        except KeyboardInterrupt:
+            pass
+    cap.release()
+
+    print(f"✅ {rec.count} frames gravados.")
+    return rec.count
+
+
+# ========== BACKENDS ==========
+def yolo_backend(model_path, conf=0.9, imgsz=None):
+    """Backend Ultralytics (.pt, ONNX ou pasta NCNN). Retorna [(x1, y1, x2, y2, conf), ...]."""
+    from ultralytics import YOLO
+    model = YOLO(model_path, task='detect')
+    kwargs = {'conf': conf, 'verbose': False}
+    if imgsz:
+        kwargs['imgsz'] = imgsz
+
+    def infer(frame):
+        r = model.predict(frame, **kwargs)[0]
+        boxes = r.boxes.xyxy.cpu().numpy()
+        confs = r.boxes.conf.cpu().numpy()
+        return [(*b, c) for b, c in zip(boxes.tolist(), confs.tolist())]
+
+    return infer
+
+
+# ========== REPLAY ==========
+def replay(recording, infer, fps=None, timer=time.perf_counter):
+    """
+    Alimenta o backend com os frames gravados simulando a câmera em tempo real.
+
+    O relógio é virtual: avança pelo tempo medido de cada inferência e, como
+    na câmera, só o frame mais recente é processado; os que chegaram enquanto
+    o modelo estava ocupado são descartados. Com `fps` os frames chegam a
+    intervalos fixos, senão nos timestamps originais. Os frames são
+    decodificados só quando escolhidos (a decodificação não entra na medição).
+    """
+    total = len(recording)
+    if total == 0:
+        raise ValueError("Gravação vazia.")
+
+    if fps:
+        arrivals = [i / fps for i in range(total)]
+    else:
+        arrivals = [ts - recording.timestamps[0] for ts in recording.timestamps]
+
+    clock = 0.0
+    nxt = 0  # primeiro frame ainda não consumido
+    processed = []
+    dropped = 0
+
+    first = recording.frame(0)
+    if first is None:
+        raise ValueError("Primeiro frame da gravação não decodifica.")
+    # Aquecimento fora da medição (primeira inferência aloca tudo)
+    infer(first)
+
+    while nxt < total:
+        if arrivals[nxt] > clock:
+            clock = arrivals[nxt]
+
+        # Frame mais recente disponível; os anteriores são perdidos
+        latest = nxt
+        while latest + 1 < total and arrivals[latest + 1] <= clock:
+            latest += 1
+
+        # Os frames pulados contam como perdidos mesmo se o escolhido falhar
+        dropped += latest - nxt
+        frame = recording.frame(latest)
+        if frame is None:
+            # JPEG corrompido: trata como fim da gravação
+            total = latest
+            break
+
+        start = timer()
+        detections = infer(frame)
+        infer_time = timer() - start
+
+        clock += infer_time
+        processed.append({
+            'frame': latest,
+            'infer_ms': infer_time * 1000,
+            'latency_ms': (clock - arrivals[latest]) * 1000,
+            'detections': detections,
+        })
+        nxt = latest + 1
+
+    return summarize(processed, dropped, total)
+
+
+# ========== MÉTRICAS ==========
+def iou(a, b):
+    x1, y1 = max(a[0], b[0]), max(a[1], b[1])
+    x2, y2 = min(a[2], b[2]), min(a[3], b[3])
+    inter = max(0.0, x2 - x1) * max(0.0, y2 - y1)
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+def detection_stability(processed):
+    """IoU médio entre detecções de frames processados consecutivos e taxa de flicker."""
+    ious, flicker = [], 0
+    for prev, cur in zip(processed, processed[1:]):
+        a, b = prev['detections'], cur['detections']
+        if len(a) != len(b):
+            flicker += 1
+        for box in b:
+            ious.append(max((iou(box, p) for p in a), default=0.0))
+
+    pairs = max(len(processed) - 1, 1)
+    return {
+        'mean_iou': float(np.mean(ious)) if ious else None,
+        'matched_frac': float(np.mean([v >= IOU_MATCH for v in ious])) if ious else None,
+        'flicker_rate': flicker / pairs,
+    }
+
+
+def summarize(processed, dropped, total):
+    latency = np.array([p['latency_ms'] for p in processed])
+    infer = np.array([p['infer_ms'] for p in processed])
+    summary = {
+        'frames': total,
+        'processed': len(processed),
+        'dropped': dropped,
+        'drop_rate': dropped / total if total else 0.0,
+        'latency_p50_ms': float(np.percentile(latency, 50)),
+        'latency_p95_ms': float(np.percentile(latency, 95)),
+        'latency_p99_ms': float(np.percentile(latency, 99)),
+        'infer_p50_ms': float(np.percentile(infer, 50)),
+        'with_detection_frac': float(np.mean([bool(p['detections']) for p in processed])),
+    }
+    summary.update(detection_stability(processed))
+    return summary
+
+
+def print_summary(s):
+    print(f"\n--- REPLAY ({s['frames']} frames) ---")
+    print(f"Processados: {s['processed']} | Descartados: {s['dropped']} ({s['drop_rate']:.1%})")
+    print(f"Latência p50/p95/p99: {s['latency_p50_ms']:.1f} / {s['latency_p95_ms']:.1f} / {s['latency_p99_ms']:.1f} ms")
+    print(f"Inferência p50: {s['infer_p50_ms']:.1f} ms")
+    print(f"Frames com detecção: {s['with_detection_frac']:.1%} | Flicker: {s['flicker_rate']:.1%}")
+    if s['mean_iou'] is not None:
+        print(f"IoU médio entre frames: {s['mean_iou']:.3f} (>= {IOU_MATCH}: {s['matched_frac']:.1%})")
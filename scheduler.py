@@ -0,0 +1,134 @@
+import os
+import time
+
+import numpy as np
+import cv2
+
+# ================= CONFIG =================
+DOWNSAMPLE = (64, 48)   # resolução do frame usado no cálculo de movimento
+REF_FPS = 30.0          # o movimento é normalizado para "diferença por frame a 30 fps"
+# Limiares na escala da diferença média do thumbnail (0-1). O ruído de sensor
+# fica em ~0.002; um pan de 1 px/frame em 640 px dá ~0.008 e a métrica
+# satura perto de 0.02-0.1 dependendo da textura do chão
+STILL_THRESHOLD = 0.004  # abaixo disso a cena é "parada"
+FAST_THRESHOLD = 0.02    # a partir disso inferimos no teto de FPS
+MIN_INFER_FPS = 2.0      # mesmo parado, atualiza as detecções nessa taxa (0 = sem piso)
+MAX_INFER_FPS = 15.0     # teto de inferências por segundo
+TIME_TOLERANCE = 1e-3    # s; evita perder o slot por arredondamento/jitter do timestamp
+
+
+class MotionGatedScheduler:
+    """
+    Decide, frame a frame, se vale rodar o detector ou reaproveitar a última
+    detecção. Usa a diferença absoluta média de frames reduzidos em cinza:
+      * `motion`: contra o frame anterior, escalado pelo intervalo entre
+        frames (não depende do FPS da câmera)
+      * `change`: contra o último frame inferido (quanto a cena já andou)
+    A taxa alvo sobe linearmente de MIN_INFER_FPS até MAX_INFER_FPS conforme
+    `max(motion, change)` vai de STILL_THRESHOLD a FAST_THRESHOLD, então
+    tanto um pan rápido quanto uma deriva lenta acumulada forçam inferência.
+    """
+
+    def __init__(self, min_fps=MIN_INFER_FPS, max_fps=MAX_INFER_FPS,
+                 still=STILL_THRESHOLD, fast=FAST_THRESHOLD, size=DOWNSAMPLE):
+        if max_fps <= 0:
+            raise ValueError("max_fps deve ser > 0.")
+        if not 0 <= min_fps <= max_fps:
+            raise ValueError("min_fps deve estar entre 0 e max_fps.")
+        if fast <= still:
+            raise ValueError("fast deve ser maior que still.")
+
+        self.min_fps = min_fps
+        self.max_fps = max_fps
+        self.still = still
+        self.fast = fast
+        self.size = size
+
+        self._prev = None
+        self._prev_time = None
+        self._ref = None
+        self._last_infer = None
+        self._last_result = None
+
+        self.frames = 0
+        self.inferences = 0
+        self.infer_time = 0.0
+        # Idade (s) das detecções reaproveitadas: só agregados, sem lista
+        self._stale_count = 0
+        self._stale_sum = 0.0
+        self._stale_max = 0.0
+        self._start = time.perf_counter()
+        self._cpu_start = self._cpu_time()
+
+    # ---------- DECISÃO ----------
+    def _small(self, frame):
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        return cv2.resize(gray, self.size, interpolation=cv2.INTER_AREA).astype(np.float32) / 255.0
+
+    def target_fps(self, score):
+        k = min(max((score - self.still) / (self.fast - self.still), 0.0), 1.0)
+        return self.min_fps + (self.max_fps - self.min_fps) * k
+
+    def should_infer(self, frame, now=None):
+        now = time.perf_counter() if now is None else now
+        small = self._small(frame)
+        prev, prev_time = self._prev, self._prev_time
+        self._prev, self._prev_time = small, now
+
+        if self._ref is None:
+            return True
+
+        dt = max(now - prev_time, 1e-3)
+        motion = float(np.mean(np.abs(small - prev))) / (dt * REF_FPS)
+        change = float(np.mean(np.abs(small - self._ref)))
+
+        elapsed = now - self._last_infer + TIME_TOLERANCE
+        if self.min_fps > 0 and elapsed >= 1.0 / self.min_fps:
+            return True
+        if change < self.still:
+            return False
+        return elapsed >= 1.0 / self.target_fps(max(motion, change))
+
+    # ---------- LOOP ----------
+    def step(self, frame, infer, now=None):
+        """Processa um frame: roda `infer(frame)` ou devolve o último resultado."""
+        now = time.perf_counter() if now is None else now
+        self.frames += 1
+
+        run = self.should_infer(frame, now)  # sempre chamado: atualiza o frame anterior
+        if run or self._last_result is None:
+            start = time.perf_counter()
+            self._last_result = infer(frame)
+            self.infer_time += time.perf_counter() - start
+            self.inferences += 1
+            self._last_infer = now
+            self._ref = self._prev
+            return self._last_result, True
+
+        age = now - self._last_infer
+        self._stale_count += 1
+        self._stale_sum += age
+        self._stale_max = max(self._stale_max, age)
+        return self._last_result, False
+
+    # ---------- MÉTRICAS ----------
+    def metrics(self):
+        wall = max(time.perf_counter() - self._start, 1e-9)
+        skipped = self.frames - self.inferences
+        mean_infer = self.infer_time / self.inferences if self.inferences else 0.0
+        return {
+            'frames': self.frames,
+            'inferences': self.inferences,
+            'camera_fps': self.frames / wall,
+            'infer_fps': self.inferences / wall,
+            'skip_rate': skipped / self.frames if self.frames else 0.0,
+            # Tempo de CPU economizado estimado pelo custo médio de uma inferência
+            'est_saved_s': skipped * mean_infer,
+            'cpu_percent': 100.0 * (self._cpu_time() - self._cpu_start) / (wall * (os.cpu_count() or 1)),
+            'staleness_mean_ms': 1000 * self._stale_sum / self._stale_count if self._stale_count else 0.0,
+            'staleness_max_ms': 1000 * self._stale_max,
+        }
+
+    def _cpu_time(self):
+        t = os.times()
+        return t.user + t.system
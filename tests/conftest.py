@@ -0,0 +1,9 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Os scripts do repo não são um pacote: importamos pelos diretórios
+for path in (ROOT, os.path.join(ROOT, 'geracao_data_augmentation')):
+    if path not in sys.path:
+        sys.path.insert(0, path)
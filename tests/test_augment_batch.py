@@ -0,0 +1,90 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+cv2 = pytest.importorskip('cv2')
+
+import augment_batch as ab
+
+
+PROBS = ['P_BRIGHTNESS_CONTRAST', 'P_ISO_NOISE', 'P_MOTION_BLUR', 'P_SHADOW']
+
+
+def _only(monkeypatch, name):
+    for p in PROBS:
+        monkeypatch.setattr(ab, p, 1.0 if p == name else 0.0)
+
+
+def _texture(h, w, seed):
+    rng = np.random.default_rng(seed)
+    return cv2.GaussianBlur(rng.integers(0, 256, (h, w, 3), dtype=np.uint8), (0, 0), 2)
+
+
+def test_keeps_shape_dtype_and_order_across_resolutions(monkeypatch):
+    for p in PROBS:
+        monkeypatch.setattr(ab, p, 0.0)
+    images = [_texture(48, 64, 0), _texture(30, 40, 1), _texture(48, 64, 2), _texture(20, 50, 3)]
+    originals = [img.copy() for img in images]
+
+    out = ab.augment_batch(images, np.random.default_rng(0))
+    assert len(out) == len(originals)
+    for img, orig in zip(out, originals):
+        assert img.dtype == np.uint8
+        np.testing.assert_array_equal(img, orig)  # probabilidades zeradas: identidade
+
+
+def test_full_pipeline_keeps_shape_and_dtype():
+    images = [_texture(48, 64, i) for i in range(4)] + [_texture(30, 40, 9)]
+    out = ab.augment_batch(images, np.random.default_rng(0))
+    assert [img.shape for img in out] == [(48, 64, 3)] * 4 + [(30, 40, 3)]
+    assert all(img.dtype == np.uint8 for img in out)
+
+
+def test_read_only_inputs_are_copied():
+    img = _texture(24, 32, 0)
+    img.flags.writeable = False
+    out = ab.augment_batch([img], np.random.default_rng(0))
+    assert out[0].flags.writeable
+
+
+@pytest.mark.parametrize('name, kernel', [
+    ('P_BRIGHTNESS_CONTRAST', ab.brightness_contrast),
+    ('P_ISO_NOISE', ab.iso_noise),
+    ('P_MOTION_BLUR', ab.motion_blur),
+    ('P_SHADOW', ab.random_shadow),
+])
+def test_parameters_differ_per_sample(monkeypatch, name, kernel):
+    _only(monkeypatch, name)
+    base = _texture(64, 64, 0)
+    images = kernel([base.copy() for _ in range(6)], np.random.default_rng(1))
+
+    changed = [not np.array_equal(img, base) for img in images]
+    assert all(changed)
+    assert len({img.tobytes() for img in images}) == len(images)
+
+
+def test_iso_noise_leaves_flat_images_alone(monkeypatch):
+    # Como no A.ISONoise: o ruído escala com o desvio padrão da luminância
+    _only(monkeypatch, 'P_ISO_NOISE')
+    flat = np.full((48, 64, 3), 128, dtype=np.uint8)
+    out = ab.iso_noise([flat.copy()], np.random.default_rng(0))
+    assert np.abs(out[0].astype(int) - 128).max() <= 1
+
+
+def test_iso_noise_brightens_on_average(monkeypatch):
+    _only(monkeypatch, 'P_ISO_NOISE')
+    base = _texture(64, 64, 0)
+    out = ab.iso_noise([base.copy()], np.random.default_rng(0))
+    assert out[0].mean() > base.mean()
+
+
+def test_motion_blur_in_place_matches_filter2d(monkeypatch):
+    _only(monkeypatch, 'P_MOTION_BLUR')
+    base = _texture(40, 50, 0)
+    rng = np.random.default_rng(3)
+    out = ab.motion_blur([base.copy()], rng)
+
+    rng = np.random.default_rng(3)
+    rng.random(1)
+    size = int(rng.integers(ab.BLUR_LIMIT[0] // 2, ab.BLUR_LIMIT[1] // 2 + 1, 1)[0]) * 2 + 1
+    angle = rng.uniform(0, 180, 1)[0]
+    np.testing.assert_array_equal(out[0], cv2.filter2D(base, -1, ab.motion_kernel(size, angle)))
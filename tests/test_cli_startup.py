@@ -0,0 +1,35 @@
+import os
+import subprocess
+import sys
+import time
+
+import cli
+
+# Orçamento generoso para CI; na prática o --help leva ~50 ms
+STARTUP_BUDGET_S = 1.0
+RUNS = 5
+
+
+def test_help_is_fast():
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, os.path.join(cli.BASE_DIR, 'cli.py'), '--help'],
+            stdout=subprocess.DEVNULL, check=True
+        )
+        times.append(time.perf_counter() - start)
+    times.sort()
+    assert times[len(times) // 2] < STARTUP_BUDGET_S
+
+
+def test_no_heavy_modules_at_startup():
+    check = (
+        'import sys, cli; cli.build_parser(); '
+        'print(",".join(m for m in cli.HEAVY_MODULES if m in sys.modules))'
+    )
+    loaded = subprocess.run(
+        [sys.executable, '-c', check], cwd=cli.BASE_DIR,
+        capture_output=True, text=True, check=True
+    ).stdout.strip()
+    assert loaded == ''
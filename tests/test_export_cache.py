@@ -0,0 +1,121 @@
+import json
+import os
+import sys
+import types
+
+import pytest
+
+import export_cache
+from export_cache import cached_export, export_sweep, export_tag, weights_hash
+
+
+class FakeYOLO:
+    """Substitui a Ultralytics: 'exporta' escrevendo um arquivo ao lado do .pt."""
+    calls = []
+
+    def __init__(self, weights):
+        self.weights = weights
+
+    def export(self, format, imgsz, half=False, simplify=False, opset=None):
+        FakeYOLO.calls.append((format, imgsz, opset, half, simplify))
+        stem = os.path.splitext(self.weights)[0]
+        if format == 'ncnn':
+            out = f'{stem}_ncnn_model'
+            os.makedirs(out)
+            with open(os.path.join(out, 'model.ncnn.bin'), 'wb') as f:
+                f.write(b'\0' * 10)
+        else:
+            out = f'{stem}.{format}'
+            with open(out, 'wb') as f:
+                f.write(b'onnx')
+        return out
+
+
+@pytest.fixture
+def fake_ultralytics(monkeypatch):
+    FakeYOLO.calls = []
+    monkeypatch.setitem(sys.modules, 'ultralytics', types.SimpleNamespace(YOLO=FakeYOLO))
+    return FakeYOLO
+
+
+@pytest.fixture
+def weights(tmp_path):
+    path = tmp_path / 'best.pt'
+    path.write_bytes(b'pesos v1')
+    return str(path)
+
+
+def test_tag_covers_every_export_argument():
+    tags = {
+        export_tag('onnx', 320, 12, False, True),
+        export_tag('onnx', 416, 12, False, True),
+        export_tag('onnx', 320, 13, False, True),
+        export_tag('onnx', 320, 12, True, True),
+        export_tag('onnx', 320, 12, False, False),
+        export_tag('ncnn', 320, 12, False, True),
+    }
+    assert len(tags) == 6
+
+
+def test_weights_hash_is_memoized_and_tracks_content(tmp_path, weights):
+    cache = str(tmp_path / 'cache')
+    first = weights_hash(weights, cache)
+    assert weights_hash(weights, cache) == first
+    assert os.path.exists(os.path.join(cache, export_cache.HASHES_NAME))
+
+    with open(weights, 'wb') as f:
+        f.write(b'pesos v2, outro tamanho')
+    assert weights_hash(weights, cache) != first
+
+
+def test_second_export_is_a_cache_hit(tmp_path, weights, fake_ultralytics):
+    cache = str(tmp_path / 'cache')
+    args = dict(format='ncnn', imgsz=320, opset=12, half=True, simplify=True, cache_dir=cache)
+
+    miss = cached_export(weights, **args)
+    hit = cached_export(weights, **args)
+
+    assert not miss['cache_hit'] and hit['cache_hit']
+    assert hit['artifact'] == miss['artifact']
+    assert os.path.isdir(hit['artifact'])
+    assert len(fake_ultralytics.calls) == 1
+
+    # Outro imgsz é outra entrada
+    cached_export(weights, **dict(args, imgsz=416))
+    assert len(fake_ultralytics.calls) == 2
+
+
+def test_export_is_published_next_to_the_weights(tmp_path, weights, fake_ultralytics):
+    cache = str(tmp_path / 'cache')
+    args = dict(format='ncnn', imgsz=320, opset=12, half=True, simplify=True, cache_dir=cache)
+
+    miss = cached_export(weights, **args)
+    assert miss['output'] == str(tmp_path / 'best_ncnn_model')
+    assert os.listdir(miss['output']) == ['model.ncnn.bin']
+
+    # Acerto no cache recria a cópia apagada
+    export_cache.shutil.rmtree(miss['output'])
+    hit = cached_export(weights, **args)
+    assert hit['cache_hit'] and os.path.isdir(hit['output'])
+
+    onnx = cached_export(weights, format='onnx', imgsz=320, cache_dir=cache)
+    assert onnx['output'] == str(tmp_path / 'best.onnx')
+    with open(onnx['output'], 'rb') as f:
+        assert f.read() == b'onnx'
+
+
+def test_sweep_stores_artifacts_side_by_side(tmp_path, weights, fake_ultralytics):
+    cache = str(tmp_path / 'cache')
+    configs = [
+        {'format': fmt, 'imgsz': size, 'opset': 12, 'half': fmt == 'ncnn', 'simplify': True}
+        for fmt in ('onnx', 'ncnn') for size in (256, 320)
+    ]
+    export_sweep(weights, configs, cache_dir=cache)
+    assert sorted(os.listdir(tmp_path)) == ['best.pt', 'cache']  # sweep não publica
+
+    root = os.path.join(cache, weights_hash(weights, cache)[:16])
+    sweep = json.load(open(os.path.join(root, export_cache.SWEEP_NAME)))
+    assert len(sweep) == 4
+    assert sorted(d for d in os.listdir(root) if d != export_cache.SWEEP_NAME) == sorted(
+        export_tag(**c) for c in configs
+    )
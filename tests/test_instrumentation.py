@@ -0,0 +1,83 @@
+import csv
+import json
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('torch')
+
+from instrumentation import ThroughputMonitor, TIMELINE_NAME
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _epoch(monitor, clock, trainer, batches, wait_s, compute_s):
+    """Simula uma época: cada batch espera `wait_s` no loader e computa `compute_s`."""
+    monitor.on_train_epoch_start(trainer)
+    for _ in range(batches):
+        clock.now += wait_s
+        monitor.on_train_batch_start(trainer)
+        clock.now += compute_s
+        monitor.on_train_batch_end(trainer)
+    monitor.on_train_epoch_end(trainer)
+    trainer.epoch += 1
+
+
+def _trainer(tmp_path, dataset_len=None):
+    loader = SimpleNamespace(dataset=range(dataset_len)) if dataset_len is not None else None
+    return SimpleNamespace(batch_size=8, epoch=0, save_dir=str(tmp_path), train_loader=loader)
+
+
+def test_epoch_splits_wait_and_compute(tmp_path):
+    clock = FakeClock()
+    monitor = ThroughputMonitor(timer=clock)
+    monitor.cuda = False
+    _epoch(monitor, clock, _trainer(tmp_path), batches=4, wait_s=0.1, compute_s=0.4)
+
+    row = monitor.timeline[0]
+    assert row['epoch'] == 1
+    assert row['wall_s'] == pytest.approx(2.0)
+    assert row['data_wait_s'] == pytest.approx(0.4)
+    assert row['compute_s'] == pytest.approx(1.6)
+    assert row['data_wait_frac'] == pytest.approx(0.2)
+    assert row['images'] == 32
+    assert row['images_per_s'] == pytest.approx(16.0)
+
+
+def test_images_capped_by_dataset_length(tmp_path):
+    clock = FakeClock()
+    monitor = ThroughputMonitor(timer=clock)
+    monitor.cuda = False
+    # Último batch incompleto: 4 batches de 8, mas só 27 imagens
+    _epoch(monitor, clock, _trainer(tmp_path, dataset_len=27), batches=4, wait_s=0.0, compute_s=0.25)
+    assert monitor.timeline[0]['images'] == 27
+
+
+def test_starvation_flag_and_outputs(tmp_path):
+    clock = FakeClock()
+    monitor = ThroughputMonitor(threshold=0.3, timer=clock)
+    monitor.cuda = False
+    trainer = _trainer(tmp_path)
+    _epoch(monitor, clock, trainer, batches=3, wait_s=0.1, compute_s=0.9)  # 10% esperando
+    assert not monitor.summary()['data_starved']
+
+    _epoch(monitor, clock, trainer, batches=3, wait_s=0.9, compute_s=0.1)  # 90% esperando
+    summary = monitor.summary()
+    assert summary['epochs'] == 2
+    assert summary['mean_data_wait_frac'] == pytest.approx(0.5)
+    assert summary['data_starved']
+
+    with open(tmp_path / f'{TIMELINE_NAME}.csv', newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert [int(r['epoch']) for r in rows] == [1, 2]
+    assert float(rows[1]['data_wait_frac']) == pytest.approx(0.9)
+
+    data = json.loads((tmp_path / f'{TIMELINE_NAME}.json').read_text())
+    assert data['summary'] == summary
+    assert len(data['epochs']) == 2
@@ -0,0 +1,69 @@
+import math
+
+import pytest
+
+torch = pytest.importorskip('torch')
+pytest.importorskip('ultralytics')
+
+import torch.nn as nn
+from ultralytics.nn.modules import Bottleneck
+
+from pruning import MIN_CHANNELS, MIN_KEEP_RATIO, apply_pruning, find_prunable_groups, plan_pruning
+
+
+def _toy(widths=(16, 64)):
+    # Cada Bottleneck é um par Conv (cv1) -> Conv2d (cv2.conv) podável
+    model = nn.Sequential(*[Bottleneck(c, c, shortcut=True, e=1.0) for c in widths])
+    for m in model:
+        n = m.cv1.bn.num_features
+        m.cv1.bn.weight.data = torch.linspace(0.1, 1.0, n)  # canal 0 é o menos importante
+    return model.eval()
+
+
+def _floor(n):
+    return max(MIN_CHANNELS, math.ceil(n * MIN_KEEP_RATIO))
+
+
+def test_plan_respects_min_channels_and_keep_ratio():
+    groups = find_prunable_groups(_toy())
+    plan, max_prune = plan_pruning(groups, 10_000)
+
+    widths = [g[0].bn.num_features for g in groups]
+    assert max_prune == sum(n - _floor(n) for n in widths)
+    for g, keep in plan.items():
+        assert len(keep) == _floor(widths[g])
+
+
+def test_plan_drops_lowest_scores_first():
+    groups = find_prunable_groups(_toy())
+    plan, _ = plan_pruning(groups, 3)
+    dropped = {
+        (g, c) for g, keep in plan.items()
+        for c in range(groups[g][0].bn.num_features) if c not in keep.tolist()
+    }
+    assert len(dropped) == 3
+    assert all(c < 4 for _, c in dropped)  # gamma crescente: só os primeiros canais saem
+
+
+def test_pruned_model_runs_and_keeps_output_shape():
+    model = _toy()
+    x = torch.randn(2, 16, 12, 12)
+    first = model[:1]
+    with torch.no_grad():
+        expected = first(x).shape
+
+    pruned = apply_pruning(model, 20)
+    assert pruned[0].cv1.conv.out_channels == pruned[0].cv2.conv.in_channels < 16
+    assert pruned[1].cv1.conv.out_channels < 64
+    assert model[0].cv1.conv.out_channels == 16  # o original não é alterado
+    with torch.no_grad():
+        assert pruned[:1](x).shape == expected
+        pruned[1](torch.randn(1, 64, 8, 8))
+
+
+def test_zero_prune_is_identity():
+    model = _toy()
+    pruned = apply_pruning(model, 0)
+    x = torch.randn(1, 16, 8, 8)
+    with torch.no_grad():
+        torch.testing.assert_close(pruned[0](x), model[0](x))
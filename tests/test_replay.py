@@ -0,0 +1,104 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('cv2')
+
+from replay import FrameRecorder, load_recording, replay, detection_stability
+
+
+def _record(path, n, fps=10):
+    with FrameRecorder(str(path)) as rec:
+        for i in range(n):
+            frame = np.full((24, 32, 3), i * 20 % 255, dtype=np.uint8)
+            rec.add(frame, timestamp=100.0 + i / fps)
+
+
+class FakeBackend:
+    """Inferência com custo fixo num relógio falso (replay determinístico)."""
+
+    def __init__(self, cost_s):
+        self.now = 0.0
+        self.cost_s = cost_s
+
+    def timer(self):
+        return self.now
+
+    def __call__(self, frame):
+        self.now += self.cost_s
+        return [(0.0, 0.0, 10.0, 10.0, 0.9)]
+
+
+def test_recording_is_lazy_and_keeps_timestamps(tmp_path):
+    path = tmp_path / 'voo.rec'
+    _record(path, 5)
+    with load_recording(str(path)) as rec:
+        assert len(rec) == 5
+        assert rec.timestamps[0] == 0.0
+        assert rec.timestamps[-1] == pytest.approx(0.4)
+        assert rec.frame(3).shape == (24, 32, 3)
+
+
+def test_truncated_last_record_is_ignored(tmp_path):
+    path = tmp_path / 'voo.rec'
+    _record(path, 5)
+    data = path.read_bytes()
+    path.write_bytes(data[:-10])  # gravador morto no meio do último JPEG
+
+    with load_recording(str(path)) as rec:
+        assert len(rec) == 4
+        assert all(rec.frame(i) is not None for i in range(len(rec)))
+
+
+def test_replay_drops_frames_like_a_live_camera(tmp_path):
+    path = tmp_path / 'voo.rec'
+    _record(path, 10)
+    backend = FakeBackend(cost_s=0.25)
+
+    with load_recording(str(path)) as rec:
+        summary = replay(rec, backend, fps=10, timer=backend.timer)
+
+    # Processa 0, 2, 5, 7, 9: os frames que chegam durante a inferência são perdidos
+    assert summary['processed'] == 5
+    assert summary['dropped'] == 5
+    assert summary['drop_rate'] == pytest.approx(0.5)
+    assert summary['latency_p50_ms'] == pytest.approx(300.0)
+    assert summary['flicker_rate'] == 0.0
+    assert summary['mean_iou'] == pytest.approx(1.0)
+
+
+class CorruptAt:
+    """Gravação em que o frame `bad` não decodifica."""
+
+    def __init__(self, recording, bad):
+        self.recording = recording
+        self.timestamps = recording.timestamps
+        self.bad = bad
+
+    def __len__(self):
+        return len(self.recording)
+
+    def frame(self, i):
+        return None if i == self.bad else self.recording.frame(i)
+
+
+def test_frames_skipped_before_a_corrupt_frame_count_as_dropped(tmp_path):
+    path = tmp_path / 'voo.rec'
+    _record(path, 10)
+    backend = FakeBackend(cost_s=0.25)
+
+    with load_recording(str(path)) as rec:
+        summary = replay(CorruptAt(rec, bad=5), backend, fps=10, timer=backend.timer)
+
+    # Processa 0 e 2; 1, 3 e 4 são perdidos; o 5 corrompido encerra a gravação
+    assert summary['frames'] == 5
+    assert summary['processed'] == 2
+    assert summary['dropped'] == 3
+    assert summary['processed'] + summary['dropped'] == summary['frames']
+
+
+def test_detection_stability_counts_flicker():
+    box = (0.0, 0.0, 10.0, 10.0, 0.9)
+    processed = [{'detections': [box]}, {'detections': []}, {'detections': [box]}]
+    stats = detection_stability(processed)
+    assert stats['flicker_rate'] == 1.0
+    assert stats['mean_iou'] == 0.0
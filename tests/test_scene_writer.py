@@ -0,0 +1,100 @@
+import io
+import json
+import os
+import tarfile
+import time
+
+import pytest
+
+Image = pytest.importorskip('PIL.Image')
+
+from scene_writer import SceneWriter, INDEX_NAME
+
+
+def _scene(i):
+    return Image.new('RGB', (32 + i, 24), (i * 10 % 255, 0, 0))
+
+
+def test_shards_are_sequential_and_indexed(tmp_path):
+    with SceneWriter(str(tmp_path), workers=4, shard_size=3) as writer:
+        for i in range(7):
+            writer.write(f'scene_{i:04d}.jpg', _scene(i), label=f'0 0.5 0.5 0.1 0.{i}\n')
+
+    index = json.loads((tmp_path / INDEX_NAME).read_text())
+    assert [e['key'] for e in index] == [f'scene_{i:04d}' for i in range(7)]
+    assert [e['shard'] for e in index] == ['shard_00000.tar'] * 3 + ['shard_00001.tar'] * 3 + ['shard_00002.tar']
+
+    with tarfile.open(tmp_path / 'shard_00000.tar') as tar:
+        assert tar.getnames() == [
+            'scene_0000.jpg', 'scene_0000.txt',
+            'scene_0001.jpg', 'scene_0001.txt',
+            'scene_0002.jpg', 'scene_0002.txt',
+        ]
+
+    # Os offsets do índice apontam direto para os bytes dentro do tar
+    for entry in index:
+        with open(tmp_path / entry['shard'], 'rb') as f:
+            f.seek(entry['label']['offset'])
+            assert f.read(entry['label']['size']).decode().startswith('0 0.5 0.5')
+            f.seek(entry['image']['offset'])
+            img = Image.open(io.BytesIO(f.read(entry['image']['size'])))
+            assert img.format == 'JPEG'
+
+
+def test_loose_files_mode(tmp_path):
+    with SceneWriter(str(tmp_path), workers=2) as writer:
+        writer.write('a.jpg', _scene(1))
+        writer.write('b.jpg', _scene(2), label='0 0.5 0.5 0.2 0.2\n')
+
+    assert sorted(os.listdir(tmp_path)) == ['a.jpg', 'b.jpg', 'b.txt']
+
+
+def test_exception_in_loop_still_finalizes_shards(tmp_path):
+    with pytest.raises(KeyboardInterrupt):
+        with SceneWriter(str(tmp_path), shard_size=10) as writer:
+            for i in range(5):
+                writer.write(f'scene_{i:04d}.jpg', _scene(i))
+            raise KeyboardInterrupt
+
+    index = json.loads((tmp_path / INDEX_NAME).read_text())
+    assert len(index) == 5
+    with tarfile.open(tmp_path / 'shard_00000.tar') as tar:
+        assert len(tar.getnames()) == 5
+
+
+def test_encode_error_closes_pool_and_reraises(tmp_path):
+    class Broken:
+        def convert(self, mode):
+            raise OSError('encode falhou')
+
+    writer = SceneWriter(str(tmp_path), workers=1, shard_size=2)
+    writer.write('bad.jpg', Broken())
+    while not writer._errors:  # espera o worker falhar
+        time.sleep(0.01)
+
+    with pytest.raises(OSError):
+        writer.write('ok.jpg', _scene(0))
+    assert not writer._writer.is_alive()
+    assert all(not t.is_alive() for t in writer._encoders)
+
+
+def test_slow_disk_blocks_the_producer(tmp_path, monkeypatch):
+    store = SceneWriter._store
+
+    def slow_store(self, *args):
+        time.sleep(0.05)
+        store(self, *args)
+
+    monkeypatch.setattr(SceneWriter, '_store', slow_store)
+    peak = 0
+    start = time.perf_counter()
+    with SceneWriter(str(tmp_path), workers=4, queue_size=4) as writer:
+        for i in range(20):
+            writer.write(f'scene_{i:04d}.jpg', _scene(i))
+            peak = max(peak, len(writer._encoded))
+        submitted = time.perf_counter() - start
+
+    # Só `queue_size` cenas à frente da escrita: o gerador anda no ritmo do disco
+    assert peak <= 4
+    assert submitted >= 15 * 0.05
+    assert len(os.listdir(tmp_path)) == 20
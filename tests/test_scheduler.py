@@ -0,0 +1,61 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+cv2 = pytest.importorskip('cv2')
+
+from scheduler import MotionGatedScheduler
+
+
+def _texture(seed=0):
+    rng = np.random.default_rng(seed)
+    noise = rng.integers(0, 256, (480, 1280), dtype=np.uint8)
+    return cv2.GaussianBlur(noise, (0, 0), 3)
+
+
+def _run(scheduler, shift_px, fps=30, seconds=4, seed=0):
+    """Pan horizontal de `shift_px` por frame; devolve as inferências por segundo."""
+    tex = _texture(seed)
+    calls = []
+    for i in range(int(seconds * fps)):
+        x = int(i * shift_px) % 640
+        frame = cv2.cvtColor(tex[:, x:x + 640], cv2.COLOR_GRAY2BGR)
+        scheduler.step(frame, lambda f: calls.append(1) or 'det', now=i / fps)
+    return len(calls) / seconds
+
+
+def test_static_scene_stays_at_min_fps():
+    rate = _run(MotionGatedScheduler(min_fps=2, max_fps=15), shift_px=0)
+    assert rate == pytest.approx(2, abs=0.5)
+
+
+def test_fast_pan_reaches_max_fps():
+    rate = _run(MotionGatedScheduler(min_fps=2, max_fps=15), shift_px=20)
+    assert rate >= 13
+
+
+def test_slow_drift_raises_the_rate():
+    rate = _run(MotionGatedScheduler(min_fps=2, max_fps=15), shift_px=1)
+    assert 3 < rate < 15
+
+
+def test_rate_does_not_depend_on_camera_fps():
+    # Mesma velocidade em px/s, câmera a 30 e a 60 fps
+    slow_cam = _run(MotionGatedScheduler(min_fps=2, max_fps=15), shift_px=4, fps=30)
+    fast_cam = _run(MotionGatedScheduler(min_fps=2, max_fps=15), shift_px=2, fps=60)
+    assert fast_cam == pytest.approx(slow_cam, rel=0.25)
+
+
+def test_min_fps_zero_means_no_floor():
+    scheduler = MotionGatedScheduler(min_fps=0, max_fps=15)
+    assert _run(scheduler, shift_px=0) == pytest.approx(0.25)  # só o primeiro frame
+    m = scheduler.metrics()
+    assert m['staleness_max_ms'] == pytest.approx(1000 * (119 / 30))
+
+
+def test_invalid_rates_raise():
+    with pytest.raises(ValueError):
+        MotionGatedScheduler(min_fps=-1)
+    with pytest.raises(ValueError):
+        MotionGatedScheduler(min_fps=5, max_fps=0)
+    with pytest.raises(ValueError):
+        MotionGatedScheduler(min_fps=20, max_fps=15)
@@ -3,7 +3,7 @@ import yaml
 import torch
 from ultralytics import YOLO
 
-from optimization import run_optimization
+from instrumentation import ThroughputMonitor
 
 MODELO_BASE = 'yolo11n.pt'
 IMG_SIZE = 512
@@ -16,17 +16,10 @@ PATIENCE = 50
 
 NOME_DA_PASTA_TUNE = 'tune_run' # alterar conforme o nome do arquivo dos best_param
 
-def start_final_training():
-    torch.cuda.empty_cache()
-    
-    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-    DATASET_PATH = os.path.join(BASE_DIR, 'dataset_para_treino', 'data.yaml')
-    
-    path_tune_escolhido = os.path.join(BASE_DIR, PROJECT_NAME_OPT, NOME_DA_PASTA_TUNE)
+def load_best_params(base_dir):
+    path_tune_escolhido = os.path.join(base_dir, PROJECT_NAME_OPT, NOME_DA_PASTA_TUNE)
     yaml_path = os.path.join(path_tune_escolhido, 'best_hyperparameters.yaml')
 
-    print(f"--- PREPARANDO TREINO FINAL ---")
-
     best_params = {}
 
     if os.path.exists(yaml_path):
@@ -46,10 +39,23 @@ def start_final_training():
         print("Verifique se o nome da pasta está correto nas Configurações Gerais.")
         print("Rodando com parâmetros PADRÃO (sem otimização).")
 
+    return best_params
+
+def start_final_training():
+    torch.cuda.empty_cache()
+    
+    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+    DATASET_PATH = os.path.join(BASE_DIR, 'dataset_para_treino', 'data.yaml')
+
+    print(f"--- PREPARANDO TREINO FINAL ---")
+
+    best_params = load_best_params(BASE_DIR)
+
     # Treino Final
     print(f"\n--- INICIANDO TREINAMENTO: {PROJECT_NAME_FINAL} ---")
     
     model = YOLO(MODELO_BASE)
+    ThroughputMonitor().register(model)
 
     model.train(
         data=DATASET_PATH,
@@ -57,7 +63,7 @@ def start_final_training():
         imgsz=IMG_SIZE,
         patience=PATIENCE,
         batch=5,           
-        device=0,
+        device=0 if torch.cuda.is_available() else 'cpu',
         workers=WORKERS,
         project=PROJECT_NAME_FINAL,
         name='detector_final',